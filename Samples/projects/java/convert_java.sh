@@ -27,9 +27,6 @@ else
     exit 1
 fi
 
-rm -rf $out
-rm -rf $out_data
-
-$PYTHON $SCRIPT -source $INPUT_DIR -out $OUTPUT_SRC_DIR -outdata $OUTPUT_DATA_DIR -namespace $NAME_SPACE
+$PYTHON $SCRIPT -source $INPUT_DIR -out $OUTPUT_SRC_DIR -outdata $OUTPUT_DATA_DIR -namespace $NAME_SPACE -prune
 
 read -p "press any key to continue..."
\ No newline at end of file
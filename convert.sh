@@ -30,9 +30,6 @@ else
     exit 1
 fi
 
-rm -rf $out
-rm -rf $out_data
-
-$PYTHON $script -source $source -out $out -outdata $out_data -namespace $name_space
+$PYTHON $script -source $source -out $out -outdata $out_data -namespace $name_space -prune
 
 # read -p "press any key to continue..."
\ No newline at end of file
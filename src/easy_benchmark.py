@@ -0,0 +1,219 @@
+#!/usr/bin/python
+# -*- coding: UTF-8 -*-
+import json
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+from openpyxl import Workbook
+from easy_converter import *
+from easy_to_all import WRITERS
+
+PHASES = ['load', 'parse', 'references', 'populate', 'encode', 'render', 'write']
+
+
+class WorkbookGenerator:
+    kinds = ['Common', 'Rare', 'Epic', 'Legendary']
+
+    def __init__(self, tables: int, rows: int, complexity: str, seed: int):
+        self.tables: int = tables
+        self.rows: int = rows
+        self.complexity: str = complexity
+        self.random: random.Random = random.Random(seed)
+
+    @staticmethod
+    def table_title(index: int) -> str:
+        return f"Bench{index}"
+
+    def get_columns(self, index: int) -> List[Tuple[str, str]]:
+        columns = [('id', 'int'), ('name', 'string'), ('weight', 'float'), ('enabled', 'bool')]
+        if self.complexity == 'simple':
+            return columns
+        kinds = str.join(',', (f"{kind},{value + 1}" for value, kind in enumerate(self.kinds)))
+        if index == 0:
+            columns.append(('kind', f"Enum<{kinds}>"))
+        else:
+            columns.append(('kind', f"@{self.table_title(0)},Kind"))
+        columns.extend([
+            ('tags', 'List<string>'),
+            ('levels', 'List<int>'),
+            ('stats', 'Map<string,int>'),
+            ('rewards', 'List<Struct<int,item,int,count>>'),
+            ('cost', 'Struct<int,gold,long,exp>'),
+        ])
+        return columns
+
+    def get_cell(self, field_def: str, row: int) -> Union[str, int, float, bool]:
+        rand = self.random
+        if field_def == 'int':
+            return row
+        if field_def == 'string':
+            return f"name {row}"
+        if field_def == 'float':
+            return round(rand.uniform(0, 100), 2)
+        if field_def == 'bool':
+            return rand.random() < 0.5
+        if field_def.startswith('Enum') or field_def.startswith('@'):
+            return rand.choice(self.kinds)
+        if field_def == 'List<string>':
+            return str.join(',', (f"tag{rand.randint(0, 50)}" for _ in range(rand.randint(1, 4))))
+        if field_def == 'List<int>':
+            return str.join(',', (str(rand.randint(1, 100)) for _ in range(rand.randint(1, 8))))
+        if field_def == 'Map<string,int>':
+            return str.join(',', (f"stat{i},{rand.randint(0, 999)}" for i in range(rand.randint(1, 4))))
+        if field_def.startswith('List<Struct'):
+            return str.join(',', (f"{rand.randint(1, 500)},{rand.randint(1, 9)}" for _ in range(rand.randint(1, 3))))
+        if field_def.startswith('Struct'):
+            return f"{rand.randint(0, 9999)},{rand.randint(0, 1 << 40)}"
+        raise Exception('unsupported field def:' + field_def)
+
+    def generate(self, path: str, workbooks: int) -> List[str]:
+        os.makedirs(path, exist_ok=True)
+        files = []
+        for book_index in range(workbooks):
+            wb = Workbook(write_only=True)
+            for index in range(book_index, self.tables, workbooks):
+                sheet = wb.create_sheet(self.table_title(index))
+                columns = self.get_columns(index)
+                sheet.append([name for name, _ in columns])
+                sheet.append([field_def for _, field_def in columns])
+                for row in range(self.rows):
+                    sheet.append([self.get_cell(field_def, row) for _, field_def in columns])
+            file = os.path.join(path, f"bench{book_index}.xlsx")
+            wb.save(file)
+            files.append(file)
+        return files
+
+
+class PhaseTimer:
+    def __init__(self):
+        self.phases: Dict[str, float] = {phase: 0.0 for phase in PHASES}
+
+    def measure(self, phase: str, func: Callable, *args, **kwargs) -> Any:
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self.phases[phase] += time.perf_counter() - start
+
+    def wrap(self, phase: str, func: Callable, exclude: Optional[str] = None) -> Callable:
+        def wrapped(*args, **kwargs):
+            excluded = self.phases[exclude] if exclude else 0.0
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                nested = self.phases[exclude] - excluded if exclude else 0.0
+                self.phases[phase] += time.perf_counter() - start - nested
+
+        return wrapped
+
+
+class Benchmark:
+
+    def __init__(self, *args, **kwargs):
+        self.source: str = kwargs["source"]
+        self.out: str = kwargs["out"]
+        self.repeat: int = kwargs.get("repeat") or 1
+        self.backend: str = kwargs.get("backend") or 'openpyxl'
+        self.writer_options: Dict[str, Any] = kwargs.get("writer_options") or {}
+
+    def run_once(self, writer_name: str) -> Dict[str, Any]:
+        timer = PhaseTimer()
+        reader = TableReader(source=self.source, backend=self.backend)
+        files = sorted(reader.find_files())
+
+        def load_sheets() -> List[SheetData]:
+            return [SheetData.from_worksheet(sheet) for file in files for sheet in TableReader.open_sheets(file, self.backend)]
+
+        sheets = timer.measure('load', load_sheets)
+        tables = timer.measure('parse', lambda: sorted((Table(sheet) for sheet in sheets), key=lambda t: t.name))
+        timer.measure('references', reader.process_reference_types, tables)
+        timer.measure('populate', lambda: [table.populate_table_data() for table in tables])
+
+        out = os.path.join(self.out, writer_name)
+        shutil.rmtree(out, ignore_errors=True)
+        writer = WRITERS[writer_name](out=out, outdata=os.path.join(out, 'data'), **self.writer_options)
+        writer.write_config = timer.wrap('write', writer.write_config)
+        writer.write_config_data = timer.wrap('write', writer.write_config_data)
+        writer.write_table_data = timer.wrap('encode', writer.write_table_data, exclude='write')
+        start = time.perf_counter()
+        writer.write_all(tables)
+        elapsed = time.perf_counter() - start
+        timer.phases['render'] = elapsed - timer.phases['encode'] - timer.phases['write']
+
+        written = [os.path.join(root, name) for root, dirs, names in os.walk(out) for name in names]
+        return {
+            'phases': timer.phases,
+            'tables': len(tables),
+            'rows': sum(len(table.data) for table in tables),
+            'files': len(written),
+            'bytes': sum(os.path.getsize(path) for path in written),
+        }
+
+    def run(self, writer_name: str) -> Dict[str, Any]:
+        best: Optional[Dict[str, Any]] = None
+        for _ in range(self.repeat):
+            try:
+                result = self.run_once(writer_name)
+            except Exception as e:
+                return {'writer': writer_name, 'error': f"{type(e).__name__}: {e}"}
+            if best is None:
+                best = result
+            else:
+                best['phases'] = {p: min(best['phases'][p], result['phases'][p]) for p in PHASES}
+        best['total'] = sum(best['phases'].values())
+        return {'writer': writer_name, **best}
+
+
+def parse_args():
+    parser = ArgumentParser()
+    parser.add_argument("-source", type=str)
+    parser.add_argument("-out", type=str)
+    parser.add_argument("-report", type=str)
+    parser.add_argument("-writers", type=str, default='cs,java,cpp,lua')
+    parser.add_argument("-tables", type=int, default=4)
+    parser.add_argument("-rows", type=int, default=1000)
+    parser.add_argument("-workbooks", type=int, default=2)
+    parser.add_argument("-complexity", type=str, default='nested', choices=['simple', 'nested'])
+    parser.add_argument("-seed", type=int, default=0)
+    parser.add_argument("-repeat", type=int, default=1)
+    parser.add_argument("-backend", type=str, default='openpyxl', choices=list(SHEET_READERS))
+    parser.add_argument("-dataformat", type=str, default='text', choices=['text', 'binary', 'both'])
+    parser.add_argument("-stringpool", action='store_true')
+    return vars(parser.parse_args())
+
+
+def main():
+    args = parse_args()
+    work_dir = tempfile.mkdtemp(prefix='easy_benchmark_')
+    try:
+        source = args["source"]
+        if source is None:
+            source = os.path.join(work_dir, 'source')
+            generator = WorkbookGenerator(args["tables"], args["rows"], args["complexity"], args["seed"])
+            generator.generate(source, max(1, min(args["workbooks"], args["tables"])))
+        benchmark = Benchmark(source=source, out=args["out"] or os.path.join(work_dir, 'out'), repeat=args["repeat"], backend=args["backend"],
+                              writer_options={'dataformat': args["dataformat"], 'stringpool': args["stringpool"]})
+        results = [benchmark.run(name) for name in args["writers"].split(',')]
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    report = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'config': {key: value for key, value in args.items() if key not in ('out', 'report')},
+        'results': results,
+    }
+    text = json.dumps(report, indent=2)
+    if args["report"]:
+        with open(args["report"], "w", encoding='utf8') as f:
+            f.write(text)
+    else:
+        sys.stdout.write(text + '\n')
+
+
+if __name__ == '__main__':
+    main()
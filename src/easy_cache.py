@@ -0,0 +1,115 @@
+#!/usr/bin/python
+# -*- coding: UTF-8 -*-
+import os
+import hashlib
+import pickle
+import tempfile
+from typing import List, Tuple, Any, Optional, Iterable
+from functools import partial
+
+from easy_fields import inflections
+from easy_readers import SheetData
+
+# the modules whose code decides what gets cached, digested into the cache version
+CONVERTER_MODULES = ('easy_fields', 'easy_readers', 'easy_cache', 'easy_encoders', 'easy_converter')
+
+
+def get_file_mode() -> int:
+    umask = os.umask(0o022)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+# temporary files are created private, replaced files get the mode a plain open() would give them
+FILE_MODE = get_file_mode()
+
+
+def replace_file(path: str, content: bytes):
+    temp = tempfile.NamedTemporaryFile(dir=os.path.dirname(path) or '.', prefix=os.path.basename(path) + '.',
+                                       suffix='.tmp', delete=False)
+    try:
+        with temp:
+            temp.write(content)
+        os.chmod(temp.name, FILE_MODE)
+        os.replace(temp.name, path)
+    except BaseException:
+        os.remove(temp.name)
+        raise
+
+
+class BuildCache:
+
+    def __init__(self, path: str):
+        self.path: str = path
+        self.version: str = self.digest_files(self.get_source_files())
+        self.inflection_count: int = 0
+
+    @staticmethod
+    def get_source_files() -> List[str]:
+        directory = os.path.dirname(os.path.abspath(__file__))
+        return [os.path.join(directory, module + '.py') for module in CONVERTER_MODULES]
+
+    @staticmethod
+    def digest_files(files: Iterable[str]) -> str:
+        sha = hashlib.sha1()
+        for file in files:
+            with open(file, 'rb') as f:
+                for chunk in iter(partial(f.read, 1 << 20), b''):
+                    sha.update(chunk)
+        return sha.hexdigest()
+
+    @staticmethod
+    def digest_strings(strings: Iterable[str]) -> str:
+        sha = hashlib.sha1()
+        for s in strings:
+            sha.update(s.encode('utf8'))
+            sha.update(b'\0')
+        return sha.hexdigest()
+
+    def entry_path(self, category: str, key: str) -> str:
+        return os.path.join(self.path, category, self.digest_strings([key]) + '.pickle')
+
+    def load(self, category: str, key: str, version: str) -> Any:
+        try:
+            with open(self.entry_path(category, key), 'rb') as f:
+                entry_version, value = pickle.load(f)
+        except (OSError, EOFError, ValueError, pickle.UnpicklingError):
+            return None
+        return value if entry_version == version else None
+
+    def save(self, category: str, key: str, version: str, value: Any):
+        path = self.entry_path(category, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        replace_file(path, pickle.dumps((version, value), pickle.HIGHEST_PROTOCOL))
+
+    @staticmethod
+    def count_inflections() -> int:
+        return sum(len(words) for words in inflections.values())
+
+    def load_inflections(self):
+        for form, words in (self.load('inflect', 'words', self.version) or {}).items():
+            inflections[form].update(words)
+        self.inflection_count = self.count_inflections()
+
+    def save_inflections(self):
+        if self.count_inflections() != self.inflection_count:
+            self.save('inflect', 'words', self.version, inflections)
+            self.inflection_count = self.count_inflections()
+
+    def load_sheets(self, file: str) -> Tuple[str, Optional[List[SheetData]]]:
+        stat = os.stat(file)
+        entry = self.load('sheets', os.path.abspath(file), self.version)
+        if entry is not None:
+            mtime, size, digest, sheets = entry
+            if mtime == stat.st_mtime_ns and size == stat.st_size:
+                return digest, sheets
+        file_digest = self.digest_files([file])
+        if entry is not None and entry[2] == file_digest:
+            self.save_sheets(file, file_digest, entry[3])
+            return file_digest, entry[3]
+        return file_digest, None
+
+    def save_sheets(self, file: str, digest: str, sheets: List[SheetData]):
+        stat = os.stat(file)
+        entry = (stat.st_mtime_ns, stat.st_size, digest, sheets)
+        self.save('sheets', os.path.abspath(file), self.version, entry)
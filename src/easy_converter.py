@@ -1,505 +1,39 @@
 #!/usr/bin/python
 # -*- coding: UTF-8 -*-
 import os
-import re
+import sys
+import time
+import json
+import hashlib
+import gzip
+import inspect
+from collections import Counter
 from abc import ABC
 from abc import abstractmethod
-from datetime import datetime
-from enum import Enum
-from openpyxl import load_workbook
-from openpyxl.worksheet.worksheet import Worksheet
 from argparse import ArgumentParser
-import inflect
-from jinja2 import Environment, FileSystemLoader
-from typing import List, Tuple, Union, Any, Optional, Iterator
+from typing import List, Tuple, Union, Any, Optional, Iterator, Iterable, Dict, Callable, Sequence, Set, TYPE_CHECKING
 from functools import partial
+from contextlib import contextmanager
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from easy_fields import *
+from easy_readers import *
+from easy_cache import *
+from easy_encoders import *
 
+try:
+    import resource
+except ImportError:
+    resource = None
 
-def upper_camel_case(var_name: str) -> str:
-    if var_name == '':
-        return var_name
-    return var_name[0].upper() + var_name[1:]
-
-
-def split_last_word(var_name: str) -> Tuple[str, Any, Any]:
-    splits = re_camel_split.findall(var_name)
-    last_word = splits[-1]
-    rest_part = ""
-    if len(splits) > 1:
-        rest_part = "".join(splits[0:-1])
-    capitalized = last_word.istitle()
-    last_word = last_word.lower()
-    return rest_part, last_word, capitalized
-
-
-engine = inflect.engine()
-re_camel_split = re.compile(r"^[a-z]+|[A-Z][^A-Z]*")
-
-
-def plural_form(singular_form_name):
-    rest_part, last_word, capitalized = split_last_word(singular_form_name)
-    last_word = engine.plural_noun(last_word)
-    if capitalized:
-        last_word = last_word.title()
-    return rest_part + last_word
-
-
-def singular_form(plural_form_name):
-    rest_part, last_word, capitalized = split_last_word(plural_form_name)
-    singular = engine.singular_noun(last_word)
-    if singular is not False:
-        last_word = singular
-    if capitalized:
-        last_word = last_word.title()
-    return rest_part + last_word
-
-
-class TokenType(Enum):
-    PrimitiveType = 1 << 0
-    BeginList = 1 << 1
-    VariableName = 1 << 2
-    ClosingBracket = 1 << 3
-    BeginDictionary = 1 << 4
-    BeginStruct = 1 << 5
-    BeginEnum = 1 << 6
-    Number = 1 << 7
-    Comma = 1 << 8
-    Reference = 1 << 9
-
-
-class Token:
-    primitive_types = ['int', 'long', 'string', 'float', 'bool']
-    value_to_token_types = {
-        'List<': TokenType.BeginList,
-        'Map<': TokenType.BeginDictionary,
-        'Struct<': TokenType.BeginStruct,
-        'Enum<': TokenType.BeginEnum,
-        '>': TokenType.ClosingBracket,
-        ',': TokenType.Comma,
-        '@': TokenType.Reference,
-    }
-    re_variable_name = re.compile(r"^\w+\d*$")
-
-    def __init__(self, value: str):
-        self.value: str = value
-        self.token_type: Optional[TokenType] = None
-        if value in self.primitive_types:
-            self.token_type = TokenType.PrimitiveType
-            return
-        self.token_type = self.value_to_token_types.get(value)
-        if self.token_type is not None:
-            return
-        if str.isdigit(value):
-            self.token_type = TokenType.Number
-            return
-        if self.re_variable_name.match(value):
-            self.token_type = TokenType.VariableName
-            return
-        raise Exception(value)
-
-
-class EnumFieldValue:
-    def __init__(self, enum_name, enum_value):
-        self.enum_name = enum_name
-        self.enum_value = enum_value
-
-
-class FieldParser:
-    re_token = re.compile(r'\w+<?|[>,@]')
-
-    def __init__(self, table_name: str, field_name: str, field_def: str):
-        self.table_name: str = table_name
-        self.field_name: str = field_name
-        self.field_def: str = field_def
-        self.tokens: List[Token] = self.tokenize()
-        self.cursor: int = 0
-        self.__field_info: Field = self.parse_field_info(self.field_name)
-        if self.cursor != len(self.tokens):
-            raise Exception("")
-
-    def tokenize(self) -> List[Token]:
-        # print(self.field_def)
-        return [Token(t) for t in self.re_token.findall(self.field_def)]
-
-    def parse_field_info(self, field_name: str) -> 'Field':
-        if self.cursor >= len(self.tokens):
-            raise Exception("")
-        token = self.tokens[self.cursor]
-        if token.token_type == TokenType.PrimitiveType:
-            return self.parse_primitive(field_name)
-        elif token.token_type == TokenType.BeginList:
-            return self.parse_list(field_name)
-        elif token.token_type == TokenType.BeginDictionary:
-            return self.parse_dictionary(field_name)
-        elif token.token_type == TokenType.BeginStruct:
-            return self.parse_struct(field_name)
-        elif token.token_type == TokenType.BeginEnum:
-            return self.parse_enum(field_name)
-        elif token.token_type == TokenType.Reference:
-            return self.parse_reference(field_name)
-        raise Exception(token.token_type)
-
-    def parse_primitive(self, field_name: str) -> 'FieldPrimitive':
-        token = self.tokens[self.cursor]
-        self.cursor += 1
-        return FieldPrimitive(self.table_name, field_name, token.value)
-
-    def parse_list(self, field_name: str) -> 'FieldList':
-        self.cursor += 1
-        element_type = self.parse_field_info(singular_form(field_name))
-        token = self.tokens[self.cursor]
-        assert token.token_type == TokenType.ClosingBracket
-        self.cursor += 1
-        return FieldList(self.table_name, field_name, element_type)
-
-    def parse_dictionary(self, field_name: str) -> 'FieldDictionary':
-        self.cursor += 1
-        key_type = self.parse_field_info('')
-        token = self.tokens[self.cursor]
-        assert token.token_type == TokenType.Comma
-        self.cursor += 1
-        value_type = self.parse_field_info('')
-        token = self.tokens[self.cursor]
-        assert token.token_type == TokenType.ClosingBracket
-        self.cursor += 1
-        return FieldDictionary(self.table_name, field_name, key_type, value_type)
-
-    def parse_struct(self, field_name: str) -> 'FieldStruct':
-        self.cursor += 1
-        struct_fields = []
-        while True:
-            field_info = self.parse_field_info('')
-            struct_fields.append(field_info)
-            token = self.tokens[self.cursor]
-            assert token.token_type == TokenType.Comma
-            self.cursor += 1
-            token = self.tokens[self.cursor]
-            assert token.token_type == TokenType.VariableName
-            field_info.field_name = token.value
-            self.cursor += 1
-            token = self.tokens[self.cursor]
-            if token.token_type == TokenType.ClosingBracket:
-                break
-            assert token.token_type == TokenType.Comma
-            self.cursor += 1
-
-        token = self.tokens[self.cursor]
-        assert token.token_type == TokenType.ClosingBracket
-        self.cursor += 1
-        return FieldStruct(self.table_name, field_name, struct_fields)
-
-    def parse_enum(self, field_name: str) -> 'FieldEnum':
-        self.cursor += 1
-        enum_values = []
-        while True:
-            token = self.tokens[self.cursor]
-            assert token.token_type == TokenType.VariableName
-            enum_name = token.value
-            self.cursor += 1
-            token = self.tokens[self.cursor]
-            assert token.token_type == TokenType.Comma
-            self.cursor += 1
-            token = self.tokens[self.cursor]
-            assert token.token_type == TokenType.Number
-            enum_value = token.value
-            enum_values.append(EnumFieldValue(enum_name, enum_value))
-            self.cursor += 1
-            token = self.tokens[self.cursor]
-            if token.token_type == TokenType.ClosingBracket:
-                break
-            assert token.token_type == TokenType.Comma
-            self.cursor += 1
-
-        token = self.tokens[self.cursor]
-        assert token.token_type == TokenType.ClosingBracket
-        self.cursor += 1
-        return FieldEnum(self.table_name, field_name, enum_values)
-
-    def parse_reference(self, field_name: str) -> 'FieldReference':
-        self.cursor += 1
-        token = self.tokens[self.cursor]
-        assert token.token_type == TokenType.VariableName
-        ref_table_name = token.value
-        self.cursor += 1
-        token = self.tokens[self.cursor]
-        assert token.token_type == TokenType.Comma
-        self.cursor += 1
-        token = self.tokens[self.cursor]
-        assert token.token_type == TokenType.VariableName
-        ref_type_name = token.value
-        self.cursor += 1
-        return FieldReference(self.table_name, field_name, ref_table_name, ref_type_name)
-
-    @property
-    def field_info(self):
-        return self.__field_info
-
-
-class FieldType(Enum):
-    Primitive = 1
-    List = 2
-    Dictionary = 3
-    Struct = 4
-    Enum = 5
-    Reference = 6
-
-
-class Field:
-    def __init__(self, table_name: str, field_name: str, field_def: str):
-        self.table_name: str = table_name
-        self.field_name: str = field_name
-        self.field_def: str = field_def
-        self.field_type: Optional[FieldType] = None
-
-    def get_associated_structs(self) -> Iterator["FieldStruct"]:
-        yield from ()
-
-    def get_associated_enums(self) -> Iterator["FieldEnum"]:
-        yield from ()
-
-    def get_associated_references(self) -> Iterator["FieldReference"]:
-        yield from ()
-
-    def cell_to_str(self, raw_cell: Union[str, float, datetime, None]) -> str:
-        return CellData.to_safe_str(raw_cell)
-
-
-class FieldPrimitive(Field):
-    def __init__(self, table_name: str, field_name: str, field_type: str):
-        super().__init__(table_name, field_name, field_type)
-        self.field_type = FieldType.Primitive
-
-
-class FieldList(Field):
-    def __init__(self, table_name: str, field_name: str, element_type: Field):
-        super().__init__(table_name, field_name, '')
-        self.field_type = FieldType.List
-        self.list_element_type = element_type
-
-    def get_associated_structs(self) -> Iterator["FieldStruct"]:
-        yield from self.list_element_type.get_associated_structs()
-
-    def get_associated_enums(self) -> Iterator["FieldEnum"]:
-        yield from self.list_element_type.get_associated_enums()
-
-    def get_associated_references(self) -> Iterator["FieldReference"]:
-        yield from self.list_element_type.get_associated_references()
-
-    def cell_to_str(self, raw_cell: Union[str, float, datetime, None]) -> str:
-        if raw_cell != '':
-            elements = CellData.cell_to_elements(raw_cell, self)
-            raw_str = str(len(elements))
-            for ele in elements:
-                raw_str = raw_str + ','
-                raw_str = raw_str + self.list_element_type.cell_to_str(ele)
-            return raw_str
-        else:
-            return '0'
-
-
-class FieldDictionary(Field):
-    def __init__(self, table_name: str, field_name: str, key_type: Field, value_type: Field):
-        super().__init__(table_name, field_name, '')
-        self.field_type = FieldType.Dictionary
-        self.dict_key_type: Field = key_type
-        self.dict_value_type: Field = value_type
-
-    def get_associated_structs(self) -> Iterator["FieldStruct"]:
-        yield from self.dict_key_type.get_associated_structs()
-        yield from self.dict_value_type.get_associated_structs()
-
-    def get_associated_enums(self) -> Iterator["FieldEnum"]:
-        yield from self.dict_key_type.get_associated_enums()
-        yield from self.dict_value_type.get_associated_enums()
-
-    def get_associated_references(self) -> Iterator["FieldReference"]:
-        yield from self.dict_key_type.get_associated_references()
-        yield from self.dict_value_type.get_associated_references()
-
-    def cell_to_str(self, raw_cell: Union[str, float, datetime, None]) -> str:
-        if raw_cell != '':
-            elements = CellData.cell_to_elements(raw_cell, self)
-            raw_str = str(len(elements))
-            for (k, v) in elements:
-                raw_str = raw_str + ','
-                raw_str = raw_str + self.dict_key_type.cell_to_str(k)
-                raw_str = raw_str + ','
-                raw_str = raw_str + self.dict_value_type.cell_to_str(v)
-            return raw_str
-        else:
-            return '0'
-
-
-class FieldStruct(Field):
-    def __init__(self, table_name: str, field_name: str, struct_fields: List[Field]):
-        field_def = upper_camel_case(field_name)
-        if field_def == field_name:
-            field_def = 'S' + field_name
-        super().__init__(table_name, field_name, field_def)
-        self.field_type = FieldType.Struct
-        self.struct_fields: List[Field] = struct_fields
-
-    def get_associated_structs(self) -> Iterator["FieldStruct"]:
-        yield self
-        for f in self.struct_fields:
-            yield from f.get_associated_structs()
-
-    def get_associated_enums(self) -> Iterator["FieldEnum"]:
-        for f in self.struct_fields:
-            yield from f.get_associated_enums()
-
-    def get_associated_references(self) -> Iterator["FieldReference"]:
-        for f in self.struct_fields:
-            yield from f.get_associated_references()
-
-    def cell_to_str(self, raw_cell: Union[str, float, datetime, None]) -> str:
-        raw_str = ''
-        elements = CellData.cell_to_elements(raw_cell, self)
-        for f, e in zip(self.struct_fields, elements):
-            if raw_str != '':
-                raw_str = raw_str + ','
-            raw_str = raw_str + f.cell_to_str(e)
-        return raw_str
-
-
-class FieldEnum(Field):
-    def __init__(self, table_name: str, field_name: str, enum_values: List[EnumFieldValue]):
-        self.table_name = table_name
-        field_def = upper_camel_case(field_name)
-        if field_def == field_name:
-            field_def = 'E' + field_name
-        super().__init__(table_name, field_name, field_def)
-        self.field_type = FieldType.Enum
-        self.enum_values = enum_values
-        self.enum_key_to_value = {item.enum_name: item.enum_value for item in enum_values}
-
-    def get_associated_enums(self) -> Iterator["FieldEnum"]:
-        yield self
-
-    def cell_to_str(self, raw_cell: Union[str, float, datetime, None]) -> str:
-        enum_value = self.enum_key_to_value.get(raw_cell)
-        if enum_value is None:
-            raise Exception('invalid enum key:' + str(raw_cell))
-        else:
-            return str(enum_value)
-
-
-class FieldReference(Field):
-    def __init__(self, table_name: str, field_name: str, ref_table_name: str, ref_type_name: str):
-        super().__init__(table_name, field_name, '')
-        self.field_type = FieldType.Reference
-        self.ref_table_name: str = ref_table_name
-        self.ref_type_name: str = ref_type_name
-        self.ref_type: Optional[Field] = None
-
-    def get_associated_references(self) -> Iterator["FieldReference"]:
-        yield self
-
-    def cell_to_str(self, raw_cell: Union[str, float, datetime, None]) -> str:
-        assert self.ref_type is not None, \
-            f'Reference not found: {self.ref_table_name},{self.ref_type_name} in {self.table_name},{self.field_name}'
-        return self.ref_type.cell_to_str(raw_cell)
-
-
-class Scheme:
-
-    def __init__(self, name: str, field_pairs: Iterator[Tuple[str, str]]):
-        self.full_name: str = name
-        self.name: str = name
-        self.fields: List[Field] = self.populate_fields(field_pairs)
-
-    def populate_fields(self, field_pairs: Iterator[Tuple[str, str]]) -> List[Field]:
-        fields: List[Field] = []
-        for field_name, field_def in field_pairs:
-            parser = FieldParser(self.name, field_name, field_def)
-            fields.append(parser.field_info)
-        return fields
-
-    def get_associated_structs(self) -> List["FieldStruct"]:
-        structs = []
-        for f in self.fields:
-            structs.extend(f.get_associated_structs())
-        return structs
-
-    def get_associated_enums(self) -> List['FieldEnum']:
-        enums = []
-        for f in self.fields:
-            enums.extend(f.get_associated_enums())
-        return enums
-
-    def get_associated_references(self) -> List['FieldReference']:
-        references = []
-        for f in self.fields:
-            references.extend(f.get_associated_references())
-        return references
-
-
-class CellData:
-    def __init__(self, raw_cell: Union[str, float, datetime, None], field: Field):
-        self.field = field
-        self.raw_str = field.cell_to_str(raw_cell)
-
-    @staticmethod
-    def cell_to_elements(raw_cell, field):
-        try:
-            if raw_cell is None or raw_cell == '':
-                return []
-            if isinstance(field, FieldList):
-                elements = raw_cell.split(',')
-                sub_element_size = 1
-                if isinstance(field.list_element_type, FieldStruct):
-                    sub_element_size = len(field.list_element_type.struct_fields)
-                return [','.join(elements[i:i + sub_element_size])
-                        for i in range(0, len(elements), sub_element_size)]
-            elif isinstance(field, FieldDictionary):
-                elements = raw_cell.split(',')
-                sub_element_size = 1
-                if isinstance(field.dict_value_type, FieldStruct):
-                    sub_element_size = len(field.dict_value_type.struct_fields)
-                return [(elements[i], ','.join(elements[i + 1: i + 1 + sub_element_size]))
-                        for i in range(0, len(elements), sub_element_size + 1)]
-            elif isinstance(field, FieldStruct):
-                elements = raw_cell.split(',')
-                return elements
-            return [raw_cell]
-        except Exception as e:
-            print(f"error in reading: {field.table_name},{field.field_name},{raw_cell}")
-            raise e
-
-    @staticmethod
-    def to_safe_str(raw_str: Union[str, float, datetime, None]) -> str:
-        if raw_str is None:
-            return ''
-        new_str = str(raw_str)
-        for old, new in Table.special_str.items():
-            new_str = new_str.replace(old, new)
-        return new_str
-
-    def __str__(self) -> str:
-        if self.raw_str is None:
-            return ''
-        return self.raw_str
-
-
-class RowData:
-    def __init__(self):
-        self.cells: List[CellData] = []
-
-    def append(self, cell: CellData):
-        self.cells.append(cell)
-
-    def __iter__(self) -> Iterator[CellData]:
-        return (cell for cell in self.cells)
+if TYPE_CHECKING:
+    from jinja2 import Environment
 
 
 class Table:
-    special_str = {
-        '\n': ';l/~',
-        '\\,': ':l/~',
-    }
+    special_str = CellData.special_str
 
-    def __init__(self, sheet: Worksheet):
-        self.__sheet: Worksheet = sheet
+    def __init__(self, sheet: Sheet):
+        self.__sheet: Sheet = sheet
         self.name = upper_camel_case(sheet.title)
 
         field_names = self.try_read_field_names()
@@ -508,7 +42,31 @@ class Table:
         pairs: Iterator[Tuple[str, str]] = zip(field_names, field_defs)
         self.scheme: Scheme = Scheme(self.name, pairs)
 
-        self.data: List[RowData] = []
+        self.fingerprint: Optional[str] = None
+        self.row_count: Optional[int] = None
+        self.__data: Optional[TableData] = None
+
+    @property
+    def data(self) -> TableData:
+        if self.__data is None:
+            self.populate_table_data()
+        return self.__data
+
+    @data.setter
+    def data(self, data: Optional[TableData]):
+        self.__data = data
+
+    def iter_rows(self) -> Iterator[Sequence[str]]:
+        if self.__data is not None:
+            return self.__data.iter_values()
+        return self.stream_table_data()
+
+    def iter_columns(self, indexes: List[int]) -> Iterator[Tuple[str, ...]]:
+        if self.__data is not None:
+            return zip(*(TableData.iter_column(self.__data.columns[index]) for index in indexes))
+        encoders = [self.scheme.fields[index].get_cell_encoder() for index in indexes]
+        rows = self.__sheet.iter_rows(values_only=True, min_row=3, min_col=1, max_col=max(indexes) + 1)
+        return (tuple(encode(row[index]) for encode, index in zip(encoders, indexes)) for row in rows if row[0] is not None)
 
     def try_read_field_names(self) -> Iterator[str]:
         for row in self.__sheet.iter_rows(values_only=True, min_row=1, max_row=1):
@@ -518,46 +76,396 @@ class Table:
         for row in self.__sheet.iter_rows(values_only=True, min_row=2, max_row=2):
             return (str(x) for x in row if x is not None and x != '')
 
-    def populate_table_data(self) -> None:
-        columns = len(self.scheme.fields)
-        for row in self.__sheet.iter_rows(values_only=True, min_row=3, min_col=1, max_col=columns):
+    def stream_table_data(self) -> Iterator[List[str]]:
+        encoders = self.scheme.get_cell_encoders()
+        count = 0
+        for row in self.__sheet.iter_rows(values_only=True, min_row=3, min_col=1, max_col=len(encoders)):
             if row[0] is None:
                 continue
-            row_data: RowData = RowData()
-            for index, cell in enumerate(row):
-                cell_data = CellData(cell, self.scheme.fields[index])
-                row_data.append(cell_data)
-            self.data.append(row_data)
+            count += 1
+            yield [encode(cell) for encode, cell in zip(encoders, row)]
+        self.row_count = count
 
+    def populate_table_data(self) -> None:
+        self.__data = self.read_table_data()
+        self.row_count = len(self.__data)
+
+    def read_table_data(self) -> TableData:
+        if self.__data is not None:
+            return self.__data
+        data = TableData(self.scheme.fields)
+        for row in self.stream_table_data():
+            data.append(row)
+        data.pack()
+        return data
+
+
+class ProfileEntry:
+    def __init__(self, category: str, name: str):
+        self.category: str = category
+        self.name: str = name
+        self.wall: float = 0.0
+        self.cpu: float = 0.0
+        self.peak_rss: int = 0
+        self.rows: int = 0
+        self.cells: int = 0
+
+    def count(self, rows: Optional[int], columns: int):
+        if rows is not None:
+            self.rows += rows
+            self.cells += rows * columns
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'category': self.category,
+            'name': self.name,
+            'wall': round(self.wall, 6),
+            'cpu': round(self.cpu, 6),
+            'peak_rss_kb': self.peak_rss,
+            'rows': self.rows,
+            'cells': self.cells,
+        }
+
+
+class Profiler:
+
+    def __init__(self, report_path: Optional[str] = None):
+        self.enabled: bool = report_path is not None
+        self.report_path: Optional[str] = report_path
+        self.entries: List[ProfileEntry] = []
+
+    @staticmethod
+    def get_peak_rss() -> int:
+        if resource is None:
+            return 0
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak // 1024 if sys.platform == 'darwin' else peak
+
+    @contextmanager
+    def record(self, category: str, name: str) -> Iterator[ProfileEntry]:
+        entry = ProfileEntry(category, name)
+        if not self.enabled:
+            yield entry
+            return
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        try:
+            yield entry
+        finally:
+            entry.wall = time.perf_counter() - wall
+            entry.cpu = time.process_time() - cpu
+            entry.peak_rss = self.get_peak_rss()
+            self.entries.append(entry)
+
+    def print_summary(self, limit: int = 20):
+        totals: Dict[str, ProfileEntry] = {}
+        for entry in self.entries:
+            total = totals.setdefault(entry.category, ProfileEntry(entry.category, '*'))
+            total.wall += entry.wall
+            total.cpu += entry.cpu
+            total.peak_rss = max(total.peak_rss, entry.peak_rss)
+            total.rows += entry.rows
+            total.cells += entry.cells
+        line = "{:<16} {:<40} {:>9} {:>9} {:>10} {:>9} {:>10}"
+        print(line.format('category', 'name', 'wall(s)', 'cpu(s)', 'rss(KB)', 'rows', 'cells'))
+        slowest = sorted(self.entries, key=lambda e: e.wall, reverse=True)[:limit]
+        for entry in sorted(totals.values(), key=lambda e: e.wall, reverse=True) + slowest:
+            print(line.format(entry.category, entry.name[:40], f"{entry.wall:.3f}", f"{entry.cpu:.3f}",
+                              entry.peak_rss, entry.rows, entry.cells))
+
+    def write_report(self):
+        report = {
+            'peak_rss_kb': self.get_peak_rss(),
+            'entries': [entry.to_dict() for entry in sorted(self.entries, key=lambda e: e.wall, reverse=True)],
+        }
+        with open(self.report_path, "w", encoding='utf8') as f:
+            json.dump(report, f, indent=2)
+
+    def report(self):
+        if not self.enabled:
+            return
+        self.print_summary()
+        self.write_report()
+        print(f"profile written to {self.report_path}")
+
+
+def read_sheet_data(file: str, backend: str = 'openpyxl') -> List[SheetData]:
+    return [SheetData.from_worksheet(sheet) for sheet in TableReader.open_sheets(file, backend)]
+
+
+def populate_table(table: Table) -> TableData:
+    table.populate_table_data()
+    return table.data
+
+
+class TableValidator:
+    max_errors = 10
+
+    def __init__(self, tables: List[Table]):
+        self.tables: Dict[str, Table] = {table.name: table for table in tables}
+        self.keys: Dict[str, Set[str]] = {}
+        self.key_columns: Dict[str, List[str]] = {}
+        self.errors: List[str] = []
+
+    def report(self, errors: List[str]):
+        self.errors.extend(errors[:self.max_errors])
+        if len(errors) > self.max_errors:
+            self.errors.append(f"... and {len(errors) - self.max_errors} more")
+
+    def get_key_column(self, table: Table) -> List[str]:
+        column = self.key_columns.get(table.name)
+        if column is None:
+            column = self.key_columns[table.name] = [row[0] for row in table.iter_columns([0])]
+        return column
+
+    def get_keys(self, table: Table) -> Set[str]:
+        keys = self.keys.get(table.name)
+        if keys is None:
+            column = self.get_key_column(table)
+            keys = self.keys[table.name] = set(column)
+            if len(keys) != len(column):
+                counts = Counter(column)
+                self.report([f"{table.name}: duplicate key {key} in {count} rows"
+                             for key, count in counts.items() if count > 1])
+        return keys
+
+    def find_references(self, table: Table, field: Field,
+                        cells: Iterable[Tuple[str, str]]) -> Dict[FieldReference, Dict[str, str]]:
+        if isinstance(field, FieldReference):
+            return {field: {value: key for key, value in cells if value}}
+        collector = ReferenceCollector()
+        errors = []
+        for key, cell in cells:
+            collector.row_key = key
+            try:
+                field.encode(iter(cell.split(',')), collector)
+            except (ValueError, StopIteration):
+                errors.append(f"{table.name}[{key}].{field.field_name}: invalid value {cell}")
+        self.report(errors)
+        return collector.getvalue()
+
+    def validate_table(self, table: Table):
+        indexes = [index for index, field in enumerate(table.scheme.fields)
+                   if any(r.ref_key for r in field.get_associated_references())]
+        # the key and every referencing column are read together, so an unpopulated sheet is read once
+        rows = list(table.iter_columns([0, *indexes])) if indexes else []
+        if indexes:
+            self.key_columns.setdefault(table.name, [row[0] for row in rows])
+        self.get_keys(table)
+        for position, index in enumerate(indexes, 1):
+            field = table.scheme.fields[index]
+            cells = ((row[0], row[position]) for row in rows)
+            for reference, values in self.find_references(table, field, cells).items():
+                missing = values.keys() - self.get_keys(self.tables[reference.ref_table_name])
+                self.report([f"{table.name}[{values[value]}].{field.field_name}: "
+                             f"{reference.ref_table_name} has no key {value}" for value in sorted(missing)])
+
+    def validate(self, tables: List[Table]) -> List[str]:
+        for table in tables:
+            self.validate_table(table)
+        return self.errors
 
-class TableReader:
 
+class TableReader:
     def __init__(self, *args, **kwargs):
         self.path_source = kwargs.get("source") or '.'
+        self.formats: List[str] = [f.strip() for f in (kwargs.get("formats") or 'xlsx').split(',') if f.strip()]
+        for source_format in self.formats:
+            if source_format not in SOURCE_FORMATS:
+                raise Exception(f"unknown format: {source_format}, expected one of {','.join(SOURCE_FORMATS)}")
+        self.source_extensions: Tuple[str, ...] = tuple(ext for f in self.formats for ext in SOURCE_FORMATS[f])
+        self.cache: Optional[BuildCache] = BuildCache(kwargs["cache"]) if kwargs.get("cache") else None
+        if self.cache is not None:
+            self.cache.load_inflections()
+        self.stream: bool = bool(kwargs.get("stream"))
+        self.backend: str = kwargs.get("backend") or 'openpyxl'
+        # streamed tables are only read again for validation when it is asked for
+        self.validate: str = kwargs.get("validate") or ('off' if self.stream else 'warn')
+        self.profiler: Profiler = Profiler(kwargs.get("profile"))
+        self.watch: bool = bool(kwargs.get("watch"))
+        self.watch_interval: float = kwargs.get("interval") or 1.0
+        self.watched: Dict[str, Tuple[Tuple[int, int], str, List[Table]]] = {}
+        self.watch_failures: Dict[str, Tuple[int, int]] = {}
+        jobs = kwargs.get("jobs")
+        self.jobs: int = 1 if jobs is None else jobs
 
     def find_files(self):
         if self.path_source is None:
             self.path_source = os.getcwd()
         source_files = []
         for root, dirs, files in os.walk(self.path_source):
-            source_files.extend([os.path.join(root, f) for f in files if f.endswith('.xlsx') and not f.startswith('_')])
+            source_files.extend([os.path.join(root, f) for f in files if f.endswith(self.source_extensions) and not f.startswith('_')])
         return source_files
 
+    @staticmethod
+    def open_sheets(file: str, backend: str = 'openpyxl') -> Iterator[Sheet]:
+        reader = SOURCE_READERS.get(os.path.splitext(file)[1]) or SHEET_READERS[backend]
+        for sheet in reader().open_sheets(file):
+            if not sheet.title.startswith('_'):
+                yield sheet
+
+    def create_executor(self) -> Optional[Executor]:
+        if self.jobs == 1:
+            return None
+        return ProcessPoolExecutor(max_workers=self.jobs or None)
+
+    @staticmethod
+    def create_table(sheet: Sheet, fingerprint: Optional[str]) -> Table:
+        table = Table(sheet)
+        table.fingerprint = fingerprint
+        return table
+
+    def read_tables(self, files: List[str], executor: Optional[Executor]) -> Iterator[Table]:
+        entries = [self.cache.load_sheets(file) if self.cache else (None, None) for file in files]
+        missing = [file for file, (_, sheets) in zip(files, entries) if sheets is None]
+        if executor is not None:
+            loaded = executor.map(partial(read_sheet_data, backend=self.backend), missing)
+        elif self.cache is not None:
+            loaded = (read_sheet_data(file, self.backend) for file in missing)
+        else:
+            loaded = (self.open_sheets(file, self.backend) for file in missing)
+
+        for file, (digest, cached_sheets) in zip(files, entries):
+            file_name = os.path.basename(file)
+            with self.profiler.record('workbook', file_name):
+                if cached_sheets is None:
+                    sheets = []
+                    for sheet in next(loaded):
+                        print(f"reading {file_name}:[{sheet.title}]...")
+                        sheets.append(sheet)
+                        yield self.read_table(file_name, sheet, digest)
+                    if self.cache is not None:
+                        self.cache.save_sheets(file, digest, sheets)
+                else:
+                    for sheet in cached_sheets:
+                        print(f"cached {file_name}:[{sheet.title}]")
+                        yield self.read_table(file_name, sheet, digest)
+
+    def read_table(self, file_name: str, sheet: Sheet, fingerprint: Optional[str]) -> Table:
+        with self.profiler.record('sheet', f"{file_name}:[{sheet.title}]"):
+            return self.create_table(sheet, fingerprint)
+
+    def populate_tables(self, tables: List[Table], executor: Optional[Executor]):
+        if executor is None:
+            for table in tables:
+                with self.profiler.record('table', table.name) as entry:
+                    table.populate_table_data()
+                    entry.count(table.row_count, len(table.scheme.fields))
+        else:
+            results = executor.map(populate_table, tables)
+            for table in tables:
+                with self.profiler.record('table', table.name) as entry:
+                    table.data = next(results)
+                    table.row_count = len(table.data)
+                    entry.count(table.row_count, len(table.scheme.fields))
+
     def create_tables(self) -> List[Table]:
         source_files = self.find_files()
-        tables = []
-        for file in source_files:
-            wb = load_workbook(filename=file, read_only=True, data_only=True)
-            for sheet in wb:
-                if not sheet.title.startswith('_'):
-                    print(f"reading {os.path.basename(file)}:[{sheet.title}]...")
-                    tables.append(Table(sheet))
-        tables.sort(key=lambda t: t.name)
-        self.process_reference_types(tables)
-        for table in tables:
-            table.populate_table_data()
+        executor = self.create_executor()
+        try:
+            tables = list(self.read_tables(source_files, executor))
+            tables.sort(key=lambda t: t.name)
+            self.process_reference_types(tables)
+            if self.cache is not None:
+                self.process_fingerprints(tables)
+            elif not self.stream:
+                self.populate_tables(tables, executor)
+            if not self.validate_tables(tables):
+                raise Exception("validation failed")
+        finally:
+            if executor is not None:
+                executor.shutdown()
         return tables
 
+    @staticmethod
+    def get_file_signature(file: str) -> Tuple[int, int]:
+        stat = os.stat(file)
+        return stat.st_mtime_ns, stat.st_size
+
+    def find_changed_files(self, signatures: Dict[str, Tuple[int, int]]) -> List[str]:
+        changed = {file for file, signature in signatures.items()
+                   if (file not in self.watched or self.watched[file][0] != signature)
+                   and self.watch_failures.get(file) != signature}
+        changed_names = {table.name for file in self.watched if file in changed or file not in signatures
+                         for table in self.watched[file][2]}
+        while changed_names:
+            dependents = {file for file, (_, _, tables) in self.watched.items()
+                          if file in signatures and file not in changed
+                          and any(r.ref_table_name in changed_names
+                                  for table in tables for r in table.scheme.get_associated_references())}
+            changed.update(dependents)
+            changed_names = {table.name for file in dependents for table in self.watched[file][2]}
+        return sorted(changed)
+
+    def update_tables(self) -> Optional[List[Table]]:
+        signatures = {file: self.get_file_signature(file) for file in self.find_files()}
+        changed = self.find_changed_files(signatures)
+        removed = [file for file in self.watched if file not in signatures]
+        if not changed and not removed:
+            return None
+        for file in removed:
+            print(f"removed {os.path.basename(file)}")
+            del self.watched[file]
+
+        new_tables = []
+        for file in changed:
+            file_name = os.path.basename(file)
+            try:
+                digest = BuildCache.digest_files([file])
+                tables = []
+                for sheet in read_sheet_data(file, self.backend):
+                    print(f"reading {file_name}:[{sheet.title}]...")
+                    tables.append(self.read_table(file_name, sheet, digest))
+            except Exception as e:
+                print(f"error in reading {file_name}: {e}")
+                self.watch_failures[file] = signatures[file]
+                continue
+            self.watch_failures.pop(file, None)
+            self.watched[file] = (signatures[file], digest, tables)
+            new_tables.extend(tables)
+        if not new_tables and not removed:
+            return None
+
+        all_tables = []
+        for _, digest, tables in self.watched.values():
+            for table in tables:
+                table.fingerprint = digest
+                all_tables.append(table)
+        all_tables.sort(key=lambda t: t.name)
+        self.process_reference_types(all_tables)
+        if not self.stream:
+            self.populate_tables(new_tables, None)
+        self.process_fingerprints(all_tables)
+        if not self.validate_tables(all_tables):
+            return None
+        return all_tables
+
+    def validate_tables(self, tables: List[Table]) -> bool:
+        if self.validate == 'off':
+            return True
+        pending = [table for table in tables
+                   if self.cache is None or not self.cache.load('validated', table.fingerprint, self.cache.version)]
+        if self.cache is not None and not self.stream:
+            # tables that were not validated yet have changed and are converted again, populate them once for both
+            self.populate_tables(pending, None)
+        with self.profiler.record('validate', 'tables'):
+            errors = TableValidator(tables).validate(pending)
+        for error in errors:
+            print(f"{'error' if self.validate == 'error' else 'warning'} in validating: {error}")
+        if not errors and self.cache is not None:
+            for table in pending:
+                self.cache.save('validated', table.fingerprint, self.cache.version, True)
+        return not errors or self.validate != 'error'
+
+    @staticmethod
+    def process_fingerprints(tables: List[Table]):
+        fingerprints = {table.name: table.fingerprint for table in tables}
+        for table in tables:
+            ref_table_names = sorted({r.ref_table_name for r in table.scheme.get_associated_references()})
+            parts = [table.name, fingerprints[table.name]]
+            parts.extend(fingerprints.get(name) or '' for name in ref_table_names)
+            table.fingerprint = BuildCache.digest_strings(parts)
+
     def process_reference_types(self, tables: List[Table]):
         sub_types = {}
         for table in tables:
@@ -569,58 +477,207 @@ class TableReader:
             for e in enums:
                 full_name = e.table_name + "," + e.field_def
                 sub_types[full_name] = e
+        keys = {table.name + "," + table.scheme.fields[0].field_name: table.scheme.fields[0]
+                for table in tables if table.scheme.fields}
         for table in tables:
             references = table.scheme.get_associated_references()
             for reference in references:
                 ref_type_full_name = reference.ref_table_name + "," + reference.ref_type_name
                 ref_type = sub_types.get(ref_type_full_name)
-                reference.ref_type = ref_type
+                reference.ref_key = ref_type is None and ref_type_full_name in keys
+                reference.ref_type = keys.get(ref_type_full_name) if reference.ref_key else ref_type
 
 
 class TableWriter(ABC):
+    # options that change the generated files; the build cache keys the output manifest on these only
+    output_options = ('out', 'outdata', 'namespace', 'dataformat', 'stringpool', 'lazy', 'index', 'compress', 'accessors')
 
     def __init__(self, *args, **kwargs):
         self.path_out: str = kwargs.get("out") or './out'
         self.path_out_data: str = kwargs.get("outdata") or './out_data'
         self.name_space: str = kwargs.get("namespace") or 'EasyConverter'
         self.file_ext: str = self.get_script_file_ext()
+        self.data_format: str = kwargs.get("dataformat") or 'text'
+        self.binary_data: bool = self.data_format != 'text'
+        self.accessors: bool = bool(kwargs.get("accessors")) and self.supports_accessors()
+        self.string_pool: Optional[StringPool] = StringPool() if kwargs.get("stringpool") and not self.accessors else None
+        self.row_index: bool = bool(kwargs.get("index"))
+        self.lazy: str = kwargs.get("lazy") or ('row' if self.row_index else 'none')
+        self.compress: bool = bool(kwargs.get("compress"))
+        self.packed_data: Dict[str, DataEncoder] = {}
+        self.cache: Optional[BuildCache] = BuildCache(kwargs["cache"]) if kwargs.get("cache") else None
+        self.manifest: Optional[Dict[str, Any]] = None
+        self.prune: bool = bool(kwargs.get("prune"))
+        self.cache_key: str = type(self).__name__ + repr([(key, kwargs.get(key)) for key in sorted(self.output_options)])
+        self.profiler: Profiler = Profiler(kwargs.get("profile"))
+        self.written_files: List[str] = []
         python_file_path = os.path.abspath(__file__)
         python_dir_path = os.path.dirname(python_file_path)
         template_path = os.path.join(python_dir_path, self.get_template_file_dir())
-        self.env: Environment = Environment(
-            loader=FileSystemLoader(template_path),
-            trim_blocks=True,
-            lstrip_blocks=True
-        )
+        self.template_path: str = template_path
+        self.env: 'Environment' = self.create_environment(template_path)
         self.env.globals['FieldType'] = FieldType
         self.env.globals['name_space'] = self.name_space
+        self.env.globals['binary_data'] = self.binary_data
+        self.env.globals['string_pool'] = self.string_pool is not None
+        self.env.globals['lazy'] = self.lazy
+        self.env.globals['row_index'] = self.row_index
+        self.env.globals['compress'] = self.compress
+        self.env.globals['accessors'] = self.accessors
+        self.env.globals['slot_size'] = FixedLayoutEncoder.slot_size
+        self.env.globals['slot_offsets'] = FixedLayoutEncoder.slot_offsets
         self.env.filters['upper_camel_case'] = upper_camel_case
         self.env.filters['plural_form'] = plural_form
         self.env.globals['get_display_def'] = partial(self.get_display_def)
 
+    def create_environment(self, template_path: str) -> 'Environment':
+        from jinja2 import Environment, FileSystemLoader, FileSystemBytecodeCache
+        if self.cache is not None:
+            bytecode_path = os.path.join(self.cache.path, 'templates')
+            os.makedirs(bytecode_path, exist_ok=True)
+            bytecode_cache = FileSystemBytecodeCache(bytecode_path)
+        else:
+            bytecode_cache = FileSystemBytecodeCache()
+        return Environment(
+            loader=FileSystemLoader(template_path),
+            bytecode_cache=bytecode_cache,
+            auto_reload=False,
+            trim_blocks=True,
+            lstrip_blocks=True
+        )
+
     @staticmethod
     def ensure_path(path: str):
         file_dir = os.path.dirname(path)
         if not os.path.isdir(file_dir):
             os.makedirs(file_dir)
 
-    def write_config(self, filename: str, text: str):
-        path = f"{self.path_out}/{filename}"
+    @staticmethod
+    def is_file_unchanged(path: str, content: bytes) -> bool:
+        try:
+            if os.path.getsize(path) != len(content):
+                return False
+        except OSError:
+            return False
+        return BuildCache.digest_files([path]) == hashlib.sha1(content).hexdigest()
+
+    def write_file(self, path: str, content: bytes):
+        self.written_files.append(path)
+        if self.is_file_unchanged(path, content):
+            return
         self.ensure_path(path)
-        with open(path, "w", encoding='utf8') as f:
-            f.write(text)
+        replace_file(path, content)
 
-    def write_config_data(self, filename: str, text: str):
-        path = f"{self.path_out_data}/{filename}"
-        self.ensure_path(path)
-        with open(path, "w", encoding='utf8') as f:
-            f.write(text)
+    def compress_data(self, content: bytes) -> bytes:
+        return gzip.compress(content, compresslevel=6, mtime=0) if self.compress else content
+
+    def write_config(self, filename: str, text: str):
+        self.write_file(f"{self.path_out}/{filename}", text.replace('\n', os.linesep).encode('utf8'))
+
+    def write_config_data(self, filename: str, text: Union[str, bytes]):
+        if not isinstance(text, bytes):
+            text = text.encode('utf8')
+        self.write_file(f"{self.path_out_data}/{filename}", self.compress_data(text))
+
+    def get_output_list_path(self) -> str:
+        return os.path.abspath(os.path.join(self.path_out, f".{type(self).__name__}.outputs.json"))
+
+    def prune_outputs(self, outputs: List[str]):
+        # only files listed by the previous run are removed, never files this writer did not generate
+        list_path = self.get_output_list_path()
+        list_dir = os.path.dirname(list_path)
+        try:
+            with open(list_path, encoding='utf8') as f:
+                previous = [os.path.normpath(os.path.join(list_dir, path)) for path in json.load(f)]
+        except (OSError, ValueError):
+            previous = []
+        keep = {os.path.abspath(path) for path in outputs}
+        for path in previous:
+            if path not in keep and os.path.isfile(path):
+                print(f"removing {path}")
+                os.remove(path)
+        paths = sorted(os.path.relpath(path, list_dir) for path in keep)
+        content = json.dumps(paths, indent=1).encode('utf8')
+        if not self.is_file_unchanged(list_path, content):
+            self.ensure_path(list_path)
+            replace_file(list_path, content)
+
+    def write_table_data(self, table: Table):
+        if self.accessors:
+            self.write_config_data(f"{table.name}.fixed.bytes", FixedLayoutEncoder().write_table(table))
+            return
+        encoder = self.packed_data.pop(table.name, None)
+        if self.data_format != 'binary':
+            pooled = encoder is not None and not self.binary_data
+            text = encoder.getvalue() if pooled else self.pack_table_data(table)
+            self.write_config_data(f"{table.name}.txt", text)
+            if self.row_index:
+                keys = encoder.row_keys if pooled else None
+                self.write_config_data(f"{table.name}.index.txt", self.pack_row_index(table, text, keys))
+        if self.binary_data:
+            if encoder is None:
+                encoder = self.encode_table(table)
+            self.write_config_data(f"{table.name}.bytes", encoder.getvalue())
+            if self.row_index:
+                self.write_config_data(f"{table.name}.index.bytes", self.pack_row_index_binary(table, encoder))
 
     @staticmethod
     def pack_table_data(table: Table) -> str:
-        rows = (str.join(",", (str(cell) for cell in row)) for row in table.data)
+        rows = (str.join(",", (str(cell) for cell in row)) for row in table.iter_rows())
         return str.join('\n', rows)
 
+    def get_index_string_key(self, value: str) -> Any:
+        return value
+
+    def sort_row_index(self, table: Table, spans: Iterable[Tuple[str, int, int]]) -> List[Tuple[str, int, int]]:
+        sort_key = FixedLayoutEncoder.compile_sort_key(table.scheme.fields[0], self.get_index_string_key)
+        return sorted(spans, key=lambda entry: sort_key(entry[0]))
+
+    def pack_row_index(self, table: Table, text: str, keys: Optional[List[str]] = None) -> str:
+        lines = text.split('\n') if text else []
+        if keys is None:
+            keys = [line.split(',', 1)[0] for line in lines]
+        spans = []
+        offset = 0
+        for key, line in zip(keys, lines):
+            length = len(line.encode('utf8'))
+            spans.append((key, offset, length))
+            offset += length + 1
+        entries = self.sort_row_index(table, spans)
+        return str.join('\n', (f"{key},{offset},{length}" for key, offset, length in entries))
+
+    def pack_row_index_binary(self, table: Table, encoder: BinaryDataEncoder) -> bytes:
+        index = BinaryDataEncoder(encoder.string_pool if encoder.shared_pool else None)
+        index.write_index(table.scheme.fields[0], self.sort_row_index(table, encoder.get_row_spans()))
+        return index.getvalue()
+
+    def create_data_encoder(self, string_pool: Optional[StringPool] = None) -> DataEncoder:
+        if self.binary_data:
+            return BinaryDataEncoder(string_pool, row_prefix=self.lazy == 'row' and not self.row_index)
+        return TextDataEncoder(string_pool)
+
+    def encode_table(self, table: Table) -> DataEncoder:
+        encoder = self.create_data_encoder()
+        encoder.write_table(table)
+        return encoder
+
+    def intern_strings(self, tables: List[Table]):
+        self.string_pool = StringPool()
+        self.packed_data = {}
+        for table in tables:
+            encoder = self.create_data_encoder(self.string_pool)
+            encoder.write_table(table)
+            self.packed_data[table.name] = encoder
+
+    def write_string_pool(self):
+        if self.binary_data:
+            self.write_config_data("StringPool.bytes", self.string_pool.pack_binary())
+        else:
+            self.write_config_data("StringPool.txt", self.string_pool.pack())
+
+    def supports_accessors(self) -> bool:
+        return False
+
     @abstractmethod
     def get_template_file_dir(self) -> str:
         raise NotImplementedError()
@@ -634,21 +691,160 @@ class TableWriter(ABC):
         raise NotImplementedError()
 
     @abstractmethod
-    def write_all(self, tables: List[Table]):
+    def convert_table(self, table: Table, context: Dict[str, Any]):
+        raise NotImplementedError()
+
+    @abstractmethod
+    def convert_manager(self, tables: List[Table], context: Dict[str, Any]):
+        raise NotImplementedError()
+
+    @abstractmethod
+    def convert_misc(self, tables: List[Table], context: Dict[str, Any]):
         raise NotImplementedError()
 
+    def get_cache_version(self) -> str:
+        files = BuildCache.get_source_files() + [inspect.getfile(type(self))]
+        for root, dirs, names in os.walk(self.template_path):
+            files.extend(os.path.join(root, name) for name in names)
+        return BuildCache.digest_files(sorted(files))
+
+    def write_outputs(self, previous: Optional[Tuple[Optional[str], List[str]]], fingerprint: Optional[str],
+                      convert: Callable[[], None]) -> Tuple[Optional[str], List[str]]:
+        if fingerprint is not None and previous is not None and previous[0] == fingerprint \
+                and all(os.path.isfile(path) for path in previous[1]):
+            return previous
+        self.written_files = []
+        convert()
+        return fingerprint, self.written_files
+
+    def write_all(self, tables: List[Table]):
+        context: Dict[str, Any] = {}
+
+        version = ''
+        manifest = {}
+        if self.cache is not None:
+            version = self.get_cache_version()
+            manifest = self.cache.load('outputs', self.cache_key, version) or {}
+        elif self.manifest is not None:
+            manifest = self.manifest
+
+        fingerprints = [table.fingerprint for table in tables]
+        if self.string_pool is not None:
+            self.intern_strings(tables)
+            pool_digest = self.string_pool.digest()
+            fingerprints = [None if f is None else BuildCache.digest_strings([f, pool_digest]) for f in fingerprints]
+
+        table_outputs = manifest.get('tables', {})
+        outputs = {}
+        for table, fingerprint in zip(tables, fingerprints):
+            convert = partial(self.convert_table, table, context)
+            with self.profiler.record('convert_table', f"{type(self).__name__}:{table.name}") as entry:
+                outputs[table.name] = self.write_outputs(table_outputs.get(table.name), fingerprint, convert)
+                entry.count(table.row_count, len(table.scheme.fields))
+        self.packed_data = {}
+
+        shared_fingerprint = None if None in fingerprints else BuildCache.digest_strings(fingerprints)
+
+        def convert_shared():
+            with self.profiler.record('convert_manager', type(self).__name__):
+                self.convert_manager(tables, context)
+            with self.profiler.record('convert_misc', type(self).__name__):
+                self.convert_misc(tables, context)
+            if self.string_pool is not None:
+                self.write_string_pool()
+
+        shared_outputs = self.write_outputs(manifest.get('shared'), shared_fingerprint, convert_shared)
+
+        self.manifest = {'tables': outputs, 'shared': shared_outputs}
+        if self.prune:
+            self.prune_outputs([path for _, paths in [*outputs.values(), shared_outputs] for path in paths])
+        if self.cache is not None:
+            self.cache.save('outputs', self.cache_key, version, self.manifest)
+
 
 class EasyConverter:
     @staticmethod
     def convert(reader: TableReader, writer: TableWriter):
-        tables = reader.create_tables()
-        writer.write_all(tables)
+        EasyConverter.convert_all(reader, [writer])
+
+    @staticmethod
+    def convert_all(reader: TableReader, writers: List[TableWriter], threads: int = 1):
+        profiler = next((p for p in [reader.profiler] + [w.profiler for w in writers] if p.enabled), reader.profiler)
+        reader.profiler = profiler
+        for writer in writers:
+            writer.profiler = profiler
+        if reader.watch:
+            EasyConverter.watch(reader, writers, threads)
+            return
+        with profiler.record('convert', 'total'):
+            tables = reader.create_tables()
+            EasyConverter.write_tables(tables, writers, threads)
+        if reader.cache is not None:
+            reader.cache.save_inflections()
+        profiler.report()
+
+    @staticmethod
+    def write_tables(tables: List[Table], writers: List[TableWriter], threads: int = 1):
+        if threads > 1 and len(writers) > 1:
+            # the writers share these tables, so fill any that -cache left unpopulated before the threads start
+            for table in tables:
+                table.populate_table_data()
+            with ThreadPoolExecutor(max_workers=threads) as executor:
+                for future in [executor.submit(writer.write_all, tables) for writer in writers]:
+                    future.result()
+        else:
+            for writer in writers:
+                writer.write_all(tables)
+
+    @staticmethod
+    def watch(reader: TableReader, writers: List[TableWriter], threads: int = 1):
+        print(f"watching {os.path.abspath(reader.path_source)}, press Ctrl+C to stop")
+        try:
+            while True:
+                start = time.perf_counter()
+                tables = reader.update_tables()
+                if tables is not None:
+                    try:
+                        EasyConverter.write_tables(tables, writers, threads)
+                        print(f"converted {len(tables)} tables in {time.perf_counter() - start:.2f}s")
+                    except Exception as e:
+                        print(f"error in converting: {e}")
+                        for writer in writers:
+                            writer.manifest = None
+                time.sleep(reader.watch_interval)
+        except KeyboardInterrupt:
+            pass
 
     @staticmethod
     def parse_args():
+        return vars(EasyConverter.create_arg_parser().parse_args())
+
+    @staticmethod
+    def create_arg_parser() -> ArgumentParser:
         parser = ArgumentParser()
         parser.add_argument("-source", type=str)
+        parser.add_argument("-formats", type=str, default='xlsx')
         parser.add_argument("-out", type=str, default='./out')
         parser.add_argument("-outdata", type=str, default='./out/data')
         parser.add_argument("-namespace", type=str, default='EasyConverter')
-        return vars(parser.parse_args())
+        parser.add_argument("-cache", type=str)
+        parser.add_argument("-jobs", type=int, default=1)
+        parser.add_argument("-stream", action='store_true')
+        parser.add_argument("-backend", type=str, default='openpyxl', choices=list(SHEET_READERS))
+        parser.add_argument("-validate", type=str, choices=['error', 'warn', 'off'])
+        parser.add_argument("-profile", type=str, nargs='?', const='easy_converter_profile.json')
+        parser.add_argument("-watch", action='store_true')
+        parser.add_argument("-prune", action='store_true')
+        parser.add_argument("-interval", type=float, default=1.0)
+        parser.add_argument("-dataformat", type=str, default='text', choices=['text', 'binary', 'both'])
+        parser.add_argument("-stringpool", action='store_true')
+        parser.add_argument("-lazy", type=str, choices=['none', 'table', 'row'])
+        parser.add_argument("-index", action='store_true')
+        parser.add_argument("-compress", action='store_true')
+        parser.add_argument("-mmap", action='store_true')
+        parser.add_argument("-accessors", action='store_true')
+        parser.add_argument("-asyncload", action='store_true')
+        parser.add_argument("-dedup", action='store_true')
+        parser.add_argument("-readonly", action='store_true')
+        parser.add_argument("-luaversion", type=str, default='5.3')
+        return parser
@@ -0,0 +1,316 @@
+#!/usr/bin/python
+# -*- coding: UTF-8 -*-
+import struct
+import itertools
+from abc import ABC
+from abc import abstractmethod
+from typing import List, Tuple, Union, Any, Optional, Iterator, Dict, Callable, Sequence, TYPE_CHECKING
+from functools import partial
+
+from easy_fields import Field, FieldType, FieldReference, CellData
+from easy_cache import BuildCache
+
+if TYPE_CHECKING:
+    from easy_converter import Table
+
+
+class StringPool:
+    def __init__(self):
+        self.strings: Dict[str, int] = {}
+
+    def index(self, value: str) -> int:
+        return self.strings.setdefault(value, len(self.strings))
+
+    def digest(self) -> str:
+        return BuildCache.digest_strings(self.strings)
+
+    def pack(self) -> str:
+        return str.join('\n', self.strings)
+
+    def pack_binary(self) -> bytes:
+        encoder = BinaryDataEncoder(self)
+        encoder.write_count(len(self.strings))
+        for s in self.strings:
+            encoded = s.encode('utf8')
+            encoder.write_count(len(encoded))
+            encoder.buffer += encoded
+        return bytes(encoder.buffer)
+
+
+class DataEncoder(ABC):
+    def __init__(self, string_pool: Optional[StringPool] = None):
+        self.shared_pool: bool = string_pool is not None
+        self.string_pool: StringPool = string_pool or StringPool()
+
+    @abstractmethod
+    def write_int(self, value: int):
+        raise NotImplementedError()
+
+    @abstractmethod
+    def write_count(self, count: int):
+        raise NotImplementedError()
+
+    @abstractmethod
+    def write_primitive(self, field_def: str, token: str):
+        raise NotImplementedError()
+
+    @abstractmethod
+    def write_table(self, table: 'Table'):
+        raise NotImplementedError()
+
+    @abstractmethod
+    def getvalue(self) -> Union[str, bytes]:
+        raise NotImplementedError()
+
+    def write_reference(self, reference: FieldReference, tokens: Iterator[str]):
+        reference.ref_type.encode(tokens, self)
+
+    def write_row(self, row: Sequence[str], fields: List[Field]):
+        for cell, field in zip(row, fields):
+            try:
+                field.encode(iter(str(cell).split(',')), self)
+            except (ValueError, StopIteration) as e:
+                print(f"error in encoding: {field.table_name},{field.field_name},{cell}")
+                raise e
+
+
+class BinaryDataEncoder(DataEncoder):
+    def __init__(self, string_pool: Optional[StringPool] = None, row_prefix: bool = False):
+        super().__init__(string_pool)
+        self.buffer: bytearray = bytearray()
+        self.row_prefix: bool = row_prefix
+        self.row_spans: List[Tuple[str, int, int]] = []
+
+    def write_varint(self, value: int):
+        while value > 0x7f:
+            self.buffer.append((value & 0x7f) | 0x80)
+            value >>= 7
+        self.buffer.append(value)
+
+    def write_int(self, value: int):
+        self.write_varint((value << 1) ^ (value >> 63))
+
+    def write_count(self, count: int):
+        self.write_int(count)
+
+    def write_float(self, value: float):
+        self.buffer += struct.pack('<f', value)
+
+    def write_bool(self, value: bool):
+        self.buffer.append(1 if value else 0)
+
+    def write_string(self, value: str):
+        self.write_varint(self.string_pool.index(value))
+
+    def write_primitive(self, field_def: str, token: str):
+        if field_def == 'int' or field_def == 'long':
+            self.write_int(int(token))
+        elif field_def == 'float':
+            self.write_float(float(token))
+        elif field_def == 'bool':
+            self.write_bool(token.lower() == 'true')
+        else:
+            self.write_string(CellData.from_safe_str(token))
+
+    def write_table(self, table: 'Table'):
+        header = self.buffer
+        self.buffer = bytearray()
+        spans = []
+        for row in table.iter_rows():
+            key = str(next(iter(row)))
+            if self.row_prefix:
+                buffer = self.buffer
+                self.buffer = bytearray()
+                self.write_row(row, table.scheme.fields)
+                buffer, self.buffer = self.buffer, buffer
+                self.write_count(len(buffer))
+                spans.append((key, len(self.buffer), len(buffer)))
+                self.buffer += buffer
+            else:
+                offset = len(self.buffer)
+                self.write_row(row, table.scheme.fields)
+                spans.append((key, offset, len(self.buffer) - offset))
+        rows, self.buffer = self.buffer, header
+        self.write_count(len(spans))
+        offset = len(self.buffer)
+        self.buffer += rows
+        self.row_spans.extend((key, start + offset, length) for key, start, length in spans)
+
+    def write_index(self, key_field: Field, entries: List[Tuple[str, int, int]]):
+        self.write_count(len(entries))
+        for key, offset, length in entries:
+            self.write_row([key], [key_field])
+            self.write_count(offset)
+            self.write_count(length)
+
+    def get_row_spans(self) -> List[Tuple[str, int, int]]:
+        header = 0 if self.shared_pool else len(self.string_pool.pack_binary())
+        return [(key, offset + header, length) for key, offset, length in self.row_spans]
+
+    def getvalue(self) -> bytes:
+        if self.shared_pool:
+            return bytes(self.buffer)
+        return self.string_pool.pack_binary() + self.buffer
+
+
+class TextDataEncoder(DataEncoder):
+    def __init__(self, string_pool: Optional[StringPool] = None):
+        super().__init__(string_pool)
+        self.rows: List[str] = []
+        self.row_keys: List[str] = []
+        self.tokens: List[str] = []
+
+    def write_int(self, value: int):
+        self.tokens.append(str(value))
+
+    def write_count(self, count: int):
+        self.tokens.append(str(count))
+
+    def write_primitive(self, field_def: str, token: str):
+        if field_def == 'string':
+            self.tokens.append(str(self.string_pool.index(token)))
+        else:
+            self.tokens.append(token)
+
+    def write_table(self, table: 'Table'):
+        for row in table.iter_rows():
+            self.row_keys.append(str(next(iter(row))))
+            self.write_row(row, table.scheme.fields)
+            self.rows.append(str.join(',', self.tokens))
+            self.tokens = []
+
+    def getvalue(self) -> str:
+        return str.join('\n', self.rows)
+
+
+class FixedLayoutEncoder:
+    slot_formats = {'int': '<i', 'long': '<q', 'float': '<f', 'bool': '<?'}
+
+    def __init__(self):
+        self.heap: bytearray = bytearray()
+        self.heap_base: int = 0
+        self.strings: Dict[str, bytes] = {}
+
+    @staticmethod
+    def resolve_field(field: Field) -> Field:
+        while isinstance(field, FieldReference):
+            field = field.ref_type
+        return field
+
+    @staticmethod
+    def slot_size(field: Field) -> int:
+        field = FixedLayoutEncoder.resolve_field(field)
+        if field.field_type == FieldType.Primitive and field.field_def in FixedLayoutEncoder.slot_formats:
+            return struct.calcsize(FixedLayoutEncoder.slot_formats[field.field_def])
+        return 4
+
+    @staticmethod
+    def slot_offsets(fields: List[Field]) -> List[int]:
+        offsets = list(itertools.accumulate((FixedLayoutEncoder.slot_size(f) for f in fields), initial=0))
+        return offsets[:-1]
+
+    @staticmethod
+    def record_size(fields: List[Field]) -> int:
+        return sum(FixedLayoutEncoder.slot_size(f) for f in fields)
+
+    @staticmethod
+    def compile_sort_key(key_field: Field, string_key: Callable[[str], Any] = partial(str.encode, encoding='utf8')) -> Callable[[str], Any]:
+        key_field = FixedLayoutEncoder.resolve_field(key_field)
+        if key_field.field_type == FieldType.Enum or key_field.field_def in ('int', 'long'):
+            return int
+        if key_field.field_def == 'float':
+            return float
+        if key_field.field_def == 'bool':
+            return lambda token: token.lower() == 'true'
+        return lambda token: string_key(CellData.from_safe_str(token))
+
+    def write_heap(self, blob: bytes) -> bytes:
+        slot = struct.pack('<i', self.heap_base + len(self.heap))
+        self.heap += blob
+        return slot
+
+    def write_string(self, value: str) -> bytes:
+        slot = self.strings.get(value)
+        if slot is None:
+            encoded = value.encode('utf8')
+            slot = self.strings[value] = self.write_heap(struct.pack('<i', len(encoded)) + encoded)
+        return slot
+
+    def write_value(self, field: Field, tokens: Iterator[str]) -> bytes:
+        field = self.resolve_field(field)
+        if field.field_type == FieldType.Primitive:
+            token = next(tokens)
+            if field.field_def == 'string':
+                return self.write_string(CellData.from_safe_str(token))
+            if field.field_def == 'bool':
+                return struct.pack('<?', token.lower() == 'true')
+            if field.field_def == 'float':
+                return struct.pack('<f', float(token))
+            return struct.pack(self.slot_formats[field.field_def], int(token))
+        if field.field_type == FieldType.Enum:
+            return struct.pack('<i', int(next(tokens)))
+        if field.field_type == FieldType.Struct:
+            return self.write_heap(self.write_record(field.struct_fields, tokens))
+        count = int(next(tokens))
+        if field.field_type == FieldType.List:
+            element_types = [field.list_element_type]
+        else:
+            element_types = [field.dict_key_type, field.dict_value_type]
+        elements = [self.write_value(f, tokens) for _ in range(count) for f in element_types]
+        return self.write_heap(struct.pack('<i', count) + b''.join(elements))
+
+    def write_record(self, fields: List[Field], tokens: Iterator[str]) -> bytes:
+        return b''.join([self.write_value(f, tokens) for f in fields])
+
+    def write_row(self, row: Sequence[str], fields: List[Field]) -> bytes:
+        slots = []
+        for cell, field in zip(row, fields):
+            try:
+                slots.append(self.write_value(field, iter(str(cell).split(','))))
+            except (ValueError, StopIteration, struct.error) as e:
+                print(f"error in encoding: {field.table_name},{field.field_name},{cell}")
+                raise e
+        return b''.join(slots)
+
+    def write_table(self, table: 'Table') -> bytes:
+        fields = table.scheme.fields
+        sort_key = self.compile_sort_key(fields[0])
+        rows = sorted(table.iter_rows(), key=lambda row: sort_key(str(next(iter(row))).split(',', 1)[0]))
+        row_size = self.record_size(fields)
+        header_size = 4 + 4 * len(rows)
+        self.heap = bytearray()
+        self.heap_base = header_size + row_size * len(rows)
+        self.strings = {}
+        buffer = bytearray(struct.pack('<i', len(rows)))
+        buffer += struct.pack(f'<{len(rows)}i', *range(header_size, self.heap_base, row_size))
+        for row in rows:
+            buffer += self.write_row(row, fields)
+        buffer += self.heap
+        return bytes(buffer)
+
+
+# visits a cell like a DataEncoder but only keeps the keys it references, with the first row referencing each
+class ReferenceCollector:
+    def __init__(self):
+        self.row_key: str = ''
+        self.values: Dict[FieldReference, Dict[str, str]] = {}
+
+    def write_int(self, value: int):
+        pass
+
+    def write_count(self, count: int):
+        pass
+
+    def write_primitive(self, field_def: str, token: str):
+        pass
+
+    def write_reference(self, reference: FieldReference, tokens: Iterator[str]):
+        if not reference.ref_key:
+            reference.ref_type.encode(tokens, self)
+            return
+        value = next(tokens)
+        if value:
+            self.values.setdefault(reference, {}).setdefault(value, self.row_key)
+
+    def getvalue(self) -> Dict[FieldReference, Dict[str, str]]:
+        return self.values
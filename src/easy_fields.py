@@ -0,0 +1,661 @@
+#!/usr/bin/python
+# -*- coding: UTF-8 -*-
+import re
+from array import array
+from datetime import datetime
+from enum import Enum
+from typing import List, Tuple, Union, Any, Optional, Iterator, Iterable, Dict, Callable, Sequence, TYPE_CHECKING
+from functools import lru_cache
+
+if TYPE_CHECKING:
+    from easy_encoders import DataEncoder, ReferenceCollector
+
+
+def upper_camel_case(var_name: str) -> str:
+    if var_name == '':
+        return var_name
+    return var_name[0].upper() + var_name[1:]
+
+
+def split_last_word(var_name: str) -> Tuple[str, Any, Any]:
+    splits = re_camel_split.findall(var_name)
+    last_word = splits[-1]
+    rest_part = ""
+    if len(splits) > 1:
+        rest_part = "".join(splits[0:-1])
+    capitalized = last_word.istitle()
+    last_word = last_word.lower()
+    return rest_part, last_word, capitalized
+
+
+engine = None
+inflections: Dict[str, Dict[str, Union[str, bool]]] = {'plural': {}, 'singular': {}}
+re_camel_split = re.compile(r"^[a-z]+|[A-Z][^A-Z]*")
+
+
+def inflect_word(form: str, word: str) -> Union[str, bool]:
+    words = inflections[form]
+    if word not in words:
+        global engine
+        if engine is None:
+            import inflect
+            engine = inflect.engine()
+        words[word] = engine.plural_noun(word) if form == 'plural' else engine.singular_noun(word)
+    return words[word]
+
+
+@lru_cache(maxsize=4096)
+def plural_form(singular_form_name):
+    rest_part, last_word, capitalized = split_last_word(singular_form_name)
+    last_word = inflect_word('plural', last_word)
+    if capitalized:
+        last_word = last_word.title()
+    return rest_part + last_word
+
+
+@lru_cache(maxsize=4096)
+def singular_form(plural_form_name):
+    rest_part, last_word, capitalized = split_last_word(plural_form_name)
+    singular = inflect_word('singular', last_word)
+    if singular is not False:
+        last_word = singular
+    if capitalized:
+        last_word = last_word.title()
+    return rest_part + last_word
+
+
+class TokenType(Enum):
+    PrimitiveType = 1 << 0
+    BeginList = 1 << 1
+    VariableName = 1 << 2
+    ClosingBracket = 1 << 3
+    BeginDictionary = 1 << 4
+    BeginStruct = 1 << 5
+    BeginEnum = 1 << 6
+    Number = 1 << 7
+    Comma = 1 << 8
+    Reference = 1 << 9
+
+
+class Token:
+    primitive_types = ['int', 'long', 'string', 'float', 'bool']
+    value_to_token_types = {
+        'List<': TokenType.BeginList,
+        'Map<': TokenType.BeginDictionary,
+        'Struct<': TokenType.BeginStruct,
+        'Enum<': TokenType.BeginEnum,
+        '>': TokenType.ClosingBracket,
+        ',': TokenType.Comma,
+        '@': TokenType.Reference,
+    }
+    re_variable_name = re.compile(r"^\w+\d*$")
+
+    def __init__(self, value: str):
+        self.value: str = value
+        self.token_type: Optional[TokenType] = None
+        if value in self.primitive_types:
+            self.token_type = TokenType.PrimitiveType
+            return
+        self.token_type = self.value_to_token_types.get(value)
+        if self.token_type is not None:
+            return
+        if str.isdigit(value):
+            self.token_type = TokenType.Number
+            return
+        if self.re_variable_name.match(value):
+            self.token_type = TokenType.VariableName
+            return
+        raise Exception(value)
+
+
+class EnumFieldValue:
+    def __init__(self, enum_name, enum_value):
+        self.enum_name = enum_name
+        self.enum_value = enum_value
+
+
+class FieldParser:
+    re_token = re.compile(r'\w+<?|[>,@]')
+
+    def __init__(self, table_name: str, field_name: str, field_def: str):
+        self.table_name: str = table_name
+        self.field_name: str = field_name
+        self.field_def: str = field_def
+        self.tokens: Sequence[Token] = self.tokenize()
+        self.cursor: int = 0
+        self.__field_info: Field = self.parse_field_info(self.field_name)
+        if self.cursor != len(self.tokens):
+            raise Exception("")
+
+    def tokenize(self) -> Sequence[Token]:
+        return self.tokenize_def(self.field_def)
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def tokenize_def(field_def: str) -> Tuple[Token, ...]:
+        return tuple(Token(t) for t in FieldParser.re_token.findall(field_def))
+
+    def parse_field_info(self, field_name: str) -> 'Field':
+        if self.cursor >= len(self.tokens):
+            raise Exception("")
+        token = self.tokens[self.cursor]
+        if token.token_type == TokenType.PrimitiveType:
+            return self.parse_primitive(field_name)
+        elif token.token_type == TokenType.BeginList:
+            return self.parse_list(field_name)
+        elif token.token_type == TokenType.BeginDictionary:
+            return self.parse_dictionary(field_name)
+        elif token.token_type == TokenType.BeginStruct:
+            return self.parse_struct(field_name)
+        elif token.token_type == TokenType.BeginEnum:
+            return self.parse_enum(field_name)
+        elif token.token_type == TokenType.Reference:
+            return self.parse_reference(field_name)
+        raise Exception(token.token_type)
+
+    def parse_primitive(self, field_name: str) -> 'FieldPrimitive':
+        token = self.tokens[self.cursor]
+        self.cursor += 1
+        return FieldPrimitive(self.table_name, field_name, token.value)
+
+    def parse_list(self, field_name: str) -> 'FieldList':
+        self.cursor += 1
+        element_type = self.parse_field_info(singular_form(field_name))
+        token = self.tokens[self.cursor]
+        assert token.token_type == TokenType.ClosingBracket
+        self.cursor += 1
+        return FieldList(self.table_name, field_name, element_type)
+
+    def parse_dictionary(self, field_name: str) -> 'FieldDictionary':
+        self.cursor += 1
+        key_type = self.parse_field_info('')
+        token = self.tokens[self.cursor]
+        assert token.token_type == TokenType.Comma
+        self.cursor += 1
+        value_type = self.parse_field_info('')
+        token = self.tokens[self.cursor]
+        assert token.token_type == TokenType.ClosingBracket
+        self.cursor += 1
+        return FieldDictionary(self.table_name, field_name, key_type, value_type)
+
+    def parse_struct(self, field_name: str) -> 'FieldStruct':
+        self.cursor += 1
+        struct_fields = []
+        while True:
+            field_info = self.parse_field_info('')
+            struct_fields.append(field_info)
+            token = self.tokens[self.cursor]
+            assert token.token_type == TokenType.Comma
+            self.cursor += 1
+            token = self.tokens[self.cursor]
+            assert token.token_type == TokenType.VariableName
+            field_info.field_name = token.value
+            self.cursor += 1
+            token = self.tokens[self.cursor]
+            if token.token_type == TokenType.ClosingBracket:
+                break
+            assert token.token_type == TokenType.Comma
+            self.cursor += 1
+
+        token = self.tokens[self.cursor]
+        assert token.token_type == TokenType.ClosingBracket
+        self.cursor += 1
+        return FieldStruct(self.table_name, field_name, struct_fields)
+
+    def parse_enum(self, field_name: str) -> 'FieldEnum':
+        self.cursor += 1
+        enum_values = []
+        while True:
+            token = self.tokens[self.cursor]
+            assert token.token_type == TokenType.VariableName
+            enum_name = token.value
+            self.cursor += 1
+            token = self.tokens[self.cursor]
+            assert token.token_type == TokenType.Comma
+            self.cursor += 1
+            token = self.tokens[self.cursor]
+            assert token.token_type == TokenType.Number
+            enum_value = token.value
+            enum_values.append(EnumFieldValue(enum_name, enum_value))
+            self.cursor += 1
+            token = self.tokens[self.cursor]
+            if token.token_type == TokenType.ClosingBracket:
+                break
+            assert token.token_type == TokenType.Comma
+            self.cursor += 1
+
+        token = self.tokens[self.cursor]
+        assert token.token_type == TokenType.ClosingBracket
+        self.cursor += 1
+        return FieldEnum(self.table_name, field_name, enum_values)
+
+    def parse_reference(self, field_name: str) -> 'FieldReference':
+        self.cursor += 1
+        token = self.tokens[self.cursor]
+        assert token.token_type == TokenType.VariableName
+        ref_table_name = token.value
+        self.cursor += 1
+        token = self.tokens[self.cursor]
+        assert token.token_type == TokenType.Comma
+        self.cursor += 1
+        token = self.tokens[self.cursor]
+        assert token.token_type == TokenType.VariableName
+        ref_type_name = token.value
+        self.cursor += 1
+        return FieldReference(self.table_name, field_name, ref_table_name, ref_type_name)
+
+    @property
+    def field_info(self):
+        return self.__field_info
+
+
+class FieldType(Enum):
+    Primitive = 1
+    List = 2
+    Dictionary = 3
+    Struct = 4
+    Enum = 5
+    Reference = 6
+
+
+class Field:
+    def __init__(self, table_name: str, field_name: str, field_def: str):
+        self.table_name: str = table_name
+        self.field_name: str = field_name
+        self.field_def: str = field_def
+        self.field_type: Optional[FieldType] = None
+        self.cell_encoder: Optional[Callable[[Any], str]] = None
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        state['cell_encoder'] = None
+        return state
+
+    def get_associated_structs(self) -> Iterator["FieldStruct"]:
+        yield from ()
+
+    def get_associated_enums(self) -> Iterator["FieldEnum"]:
+        yield from ()
+
+    def get_associated_references(self) -> Iterator["FieldReference"]:
+        yield from ()
+
+    def cell_to_str(self, raw_cell: Union[str, float, datetime, None]) -> str:
+        return self.get_cell_encoder()(raw_cell)
+
+    def get_cell_encoder(self) -> Callable[[Any], str]:
+        if self.cell_encoder is None:
+            self.cell_encoder = self.compile_cell_encoder()
+        return self.cell_encoder
+
+    def compile_cell_encoder(self) -> Callable[[Any], str]:
+        return CellData.to_safe_str
+
+    def encode(self, tokens: Iterator[str], encoder: "Union[DataEncoder, ReferenceCollector]") -> None:
+        raise NotImplementedError()
+
+
+class FieldPrimitive(Field):
+    def __init__(self, table_name: str, field_name: str, field_type: str):
+        super().__init__(table_name, field_name, field_type)
+        self.field_type = FieldType.Primitive
+
+    def encode(self, tokens: Iterator[str], encoder: "Union[DataEncoder, ReferenceCollector]") -> None:
+        encoder.write_primitive(self.field_def, next(tokens))
+
+
+class FieldList(Field):
+    def __init__(self, table_name: str, field_name: str, element_type: Field):
+        super().__init__(table_name, field_name, '')
+        self.field_type = FieldType.List
+        self.list_element_type = element_type
+
+    def get_associated_structs(self) -> Iterator["FieldStruct"]:
+        yield from self.list_element_type.get_associated_structs()
+
+    def get_associated_enums(self) -> Iterator["FieldEnum"]:
+        yield from self.list_element_type.get_associated_enums()
+
+    def get_associated_references(self) -> Iterator["FieldReference"]:
+        yield from self.list_element_type.get_associated_references()
+
+    def compile_cell_encoder(self) -> Callable[[Any], str]:
+        encode_element = self.list_element_type.get_cell_encoder()
+        split_elements = CellData.compile_splitter(self)
+        size = CellData.get_element_size(self.list_element_type)
+        plain = encode_element is CellData.to_safe_str
+
+        def encode_list(raw_cell):
+            if raw_cell is None or raw_cell == '':
+                return '0'
+            elements = split_elements(raw_cell)
+            if plain and not CellData.has_special_str(raw_cell):
+                return f"{len(elements)},{raw_cell}"
+            if size == 1:
+                parts = [encode_element(e) for e in elements]
+            else:
+                parts = [encode_element(','.join(elements[i:i + size])) for i in range(0, len(elements), size)]
+            parts.insert(0, str(len(parts)))
+            return ','.join(parts)
+
+        return encode_list
+
+    def encode(self, tokens: Iterator[str], encoder: "Union[DataEncoder, ReferenceCollector]") -> None:
+        count = int(next(tokens))
+        encoder.write_count(count)
+        for _ in range(count):
+            self.list_element_type.encode(tokens, encoder)
+
+
+class FieldDictionary(Field):
+    def __init__(self, table_name: str, field_name: str, key_type: Field, value_type: Field):
+        super().__init__(table_name, field_name, '')
+        self.field_type = FieldType.Dictionary
+        self.dict_key_type: Field = key_type
+        self.dict_value_type: Field = value_type
+
+    def get_associated_structs(self) -> Iterator["FieldStruct"]:
+        yield from self.dict_key_type.get_associated_structs()
+        yield from self.dict_value_type.get_associated_structs()
+
+    def get_associated_enums(self) -> Iterator["FieldEnum"]:
+        yield from self.dict_key_type.get_associated_enums()
+        yield from self.dict_value_type.get_associated_enums()
+
+    def get_associated_references(self) -> Iterator["FieldReference"]:
+        yield from self.dict_key_type.get_associated_references()
+        yield from self.dict_value_type.get_associated_references()
+
+    def compile_cell_encoder(self) -> Callable[[Any], str]:
+        encode_key = self.dict_key_type.get_cell_encoder()
+        encode_value = self.dict_value_type.get_cell_encoder()
+        split_elements = CellData.compile_splitter(self)
+        size = CellData.get_element_size(self.dict_value_type)
+        plain = encode_key is CellData.to_safe_str and encode_value is CellData.to_safe_str
+
+        def encode_dict(raw_cell):
+            if raw_cell is None or raw_cell == '':
+                return '0'
+            elements = split_elements(raw_cell)
+            if plain and len(elements) % 2 == 0 and not CellData.has_special_str(raw_cell):
+                return f"{len(elements) // 2},{raw_cell}"
+            parts = ['']
+            for i in range(0, len(elements), size + 1):
+                parts.append(encode_key(elements[i]))
+                parts.append(encode_value(','.join(elements[i + 1:i + 1 + size])))
+            parts[0] = str(len(parts) // 2)
+            return ','.join(parts)
+
+        return encode_dict
+
+    def encode(self, tokens: Iterator[str], encoder: "Union[DataEncoder, ReferenceCollector]") -> None:
+        count = int(next(tokens))
+        encoder.write_count(count)
+        for _ in range(count):
+            self.dict_key_type.encode(tokens, encoder)
+            self.dict_value_type.encode(tokens, encoder)
+
+
+class FieldStruct(Field):
+    def __init__(self, table_name: str, field_name: str, struct_fields: List[Field]):
+        field_def = upper_camel_case(field_name)
+        if field_def == field_name:
+            field_def = 'S' + field_name
+        super().__init__(table_name, field_name, field_def)
+        self.field_type = FieldType.Struct
+        self.struct_fields: List[Field] = struct_fields
+
+    def get_associated_structs(self) -> Iterator["FieldStruct"]:
+        yield self
+        for f in self.struct_fields:
+            yield from f.get_associated_structs()
+
+    def get_associated_enums(self) -> Iterator["FieldEnum"]:
+        for f in self.struct_fields:
+            yield from f.get_associated_enums()
+
+    def get_associated_references(self) -> Iterator["FieldReference"]:
+        for f in self.struct_fields:
+            yield from f.get_associated_references()
+
+    def compile_cell_encoder(self) -> Callable[[Any], str]:
+        encoders = [f.get_cell_encoder() for f in self.struct_fields]
+        split_elements = CellData.compile_splitter(self)
+
+        def encode_struct(raw_cell):
+            if raw_cell is None or raw_cell == '':
+                return ''
+            parts = [encode(e) for encode, e in zip(encoders, split_elements(raw_cell))]
+            # a separator is only emitted once something non-empty has been written
+            start = 0
+            while start < len(parts) and parts[start] == '':
+                start += 1
+            return ','.join(parts[start:])
+
+        return encode_struct
+
+    def encode(self, tokens: Iterator[str], encoder: "Union[DataEncoder, ReferenceCollector]") -> None:
+        for f in self.struct_fields:
+            f.encode(tokens, encoder)
+
+
+class FieldEnum(Field):
+    def __init__(self, table_name: str, field_name: str, enum_values: List[EnumFieldValue]):
+        self.table_name = table_name
+        field_def = upper_camel_case(field_name)
+        if field_def == field_name:
+            field_def = 'E' + field_name
+        super().__init__(table_name, field_name, field_def)
+        self.field_type = FieldType.Enum
+        self.enum_values = enum_values
+        self.enum_key_to_value = {item.enum_name: item.enum_value for item in enum_values}
+
+    def get_associated_enums(self) -> Iterator["FieldEnum"]:
+        yield self
+
+    def compile_cell_encoder(self) -> Callable[[Any], str]:
+        key_to_str = {key: str(value) for key, value in self.enum_key_to_value.items() if value is not None}
+
+        def encode_enum(raw_cell):
+            enum_value = key_to_str.get(raw_cell)
+            if enum_value is None:
+                raise Exception('invalid enum key:' + str(raw_cell))
+            return enum_value
+
+        return encode_enum
+
+    def encode(self, tokens: Iterator[str], encoder: "Union[DataEncoder, ReferenceCollector]") -> None:
+        encoder.write_int(int(next(tokens)))
+
+
+class FieldReference(Field):
+    def __init__(self, table_name: str, field_name: str, ref_table_name: str, ref_type_name: str):
+        super().__init__(table_name, field_name, '')
+        self.field_type = FieldType.Reference
+        self.ref_table_name: str = ref_table_name
+        self.ref_type_name: str = ref_type_name
+        self.ref_type: Optional[Field] = None
+        self.ref_key: bool = False
+
+    def get_associated_references(self) -> Iterator["FieldReference"]:
+        yield self
+
+    def compile_cell_encoder(self) -> Callable[[Any], str]:
+        assert self.ref_type is not None, \
+            f'Reference not found: {self.ref_table_name},{self.ref_type_name} in {self.table_name},{self.field_name}'
+        return self.ref_type.get_cell_encoder()
+
+    def encode(self, tokens: Iterator[str], encoder: "Union[DataEncoder, ReferenceCollector]") -> None:
+        encoder.write_reference(self, tokens)
+
+
+class Scheme:
+
+    def __init__(self, name: str, field_pairs: Iterator[Tuple[str, str]]):
+        self.full_name: str = name
+        self.name: str = name
+        self.fields: List[Field] = self.populate_fields(field_pairs)
+
+    def populate_fields(self, field_pairs: Iterator[Tuple[str, str]]) -> List[Field]:
+        fields: List[Field] = []
+        for field_name, field_def in field_pairs:
+            parser = FieldParser(self.name, field_name, field_def)
+            fields.append(parser.field_info)
+        return fields
+
+    def get_cell_encoders(self) -> List[Callable[[Any], str]]:
+        return [f.get_cell_encoder() for f in self.fields]
+
+    def get_associated_structs(self) -> List["FieldStruct"]:
+        structs = []
+        for f in self.fields:
+            structs.extend(f.get_associated_structs())
+        return structs
+
+    def get_associated_enums(self) -> List['FieldEnum']:
+        enums = []
+        for f in self.fields:
+            enums.extend(f.get_associated_enums())
+        return enums
+
+    def get_associated_references(self) -> List['FieldReference']:
+        references = []
+        for f in self.fields:
+            references.extend(f.get_associated_references())
+        return references
+
+
+class CellData:
+    __slots__ = ('field', 'raw_str')
+    special_str = {
+        '\n': ';l/~',
+        '\\,': ':l/~',
+    }
+
+    def __init__(self, raw_cell: Union[str, float, datetime, None], field: Field):
+        self.field = field
+        self.raw_str = field.cell_to_str(raw_cell)
+
+    @staticmethod
+    def from_str(raw_str: str, field: Field) -> 'CellData':
+        cell = CellData.__new__(CellData)
+        cell.field = field
+        cell.raw_str = raw_str
+        return cell
+
+    @staticmethod
+    def get_element_size(field: Field) -> int:
+        if isinstance(field, FieldStruct):
+            return len(field.struct_fields)
+        return 1
+
+    @staticmethod
+    def compile_splitter(field: Field) -> Callable[[Any], List[str]]:
+        def split_elements(raw_cell):
+            try:
+                return raw_cell.split(',')
+            except Exception as e:
+                print(f"error in reading: {field.table_name},{field.field_name},{raw_cell}")
+                raise e
+
+        return split_elements
+
+    @staticmethod
+    def has_special_str(raw_str: str) -> bool:
+        return '\n' in raw_str or '\\' in raw_str
+
+    @staticmethod
+    def to_safe_str(raw_str: Union[str, float, datetime, None]) -> str:
+        if raw_str is None:
+            return ''
+        if type(raw_str) is not str:
+            return str(raw_str)
+        if CellData.has_special_str(raw_str):
+            for old, new in CellData.special_str.items():
+                raw_str = raw_str.replace(old, new)
+        return raw_str
+
+    @staticmethod
+    def from_safe_str(safe_str: str) -> str:
+        return safe_str.replace(CellData.special_str['\n'], '\\n').replace(CellData.special_str['\\,'], ',')
+
+    def __str__(self) -> str:
+        if self.raw_str is None:
+            return ''
+        return self.raw_str
+
+
+class RowData:
+    __slots__ = ('table_data', 'index')
+
+    def __init__(self, table_data: 'TableData', index: int):
+        self.table_data: TableData = table_data
+        self.index: int = index
+
+    def __iter__(self) -> Iterator[CellData]:
+        for field, column in zip(self.table_data.fields, self.table_data.columns):
+            yield CellData.from_str(TableData.column_str(column, self.index), field)
+
+
+class TableData:
+    __slots__ = ('fields', 'columns')
+    bool_strs = ('False', 'True')
+    typecodes = {'int': 'q', 'long': 'q', 'float': 'd', 'bool': 'b'}
+
+    def __init__(self, fields: List[Field]):
+        self.fields: List[Field] = fields
+        self.columns: List[Union[List[str], array]] = [[] for _ in fields]
+
+    def append(self, values: Sequence[str]):
+        for column, value in zip(self.columns, values):
+            column.append(value)
+
+    def pack(self):
+        self.columns = [self.pack_column(column, field) for column, field in zip(self.columns, self.fields)]
+
+    @staticmethod
+    def pack_column(column: List[str], field: Field) -> Union[List[str], array]:
+        typecode = TableData.typecodes.get(field.field_def) if field.field_type == FieldType.Primitive else None
+        if typecode is None or not isinstance(column, list):
+            return column
+        try:
+            if typecode == 'b':
+                return array('b', map(TableData.bool_strs.index, column))
+            packed = array(typecode, map(int if typecode == 'q' else float, column))
+        except (ValueError, OverflowError):
+            return column
+        if not all(str(value) == raw for value, raw in zip(packed, column)):
+            return column
+        return packed
+
+    @staticmethod
+    def column_str(column: Union[List[str], array], index: int) -> str:
+        if isinstance(column, list):
+            return column[index]
+        if column.typecode == 'b':
+            return TableData.bool_strs[column[index]]
+        return str(column[index])
+
+    @staticmethod
+    def iter_column(column: Union[List[str], array]) -> Iterable[str]:
+        if isinstance(column, list):
+            return column
+        if column.typecode == 'b':
+            return map(TableData.bool_strs.__getitem__, column)
+        return map(str, column)
+
+    def iter_values(self) -> Iterator[Tuple[str, ...]]:
+        return zip(*(self.iter_column(column) for column in self.columns))
+
+    def __len__(self) -> int:
+        return len(self.columns[0]) if self.columns else 0
+
+    def __getitem__(self, index: int) -> RowData:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return RowData(self, index)
+
+    def __iter__(self) -> Iterator[RowData]:
+        return (RowData(self, index) for index in range(len(self)))
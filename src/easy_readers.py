@@ -0,0 +1,344 @@
+#!/usr/bin/python
+# -*- coding: UTF-8 -*-
+import os
+import json
+import csv
+import itertools
+import zipfile
+import posixpath
+from xml.etree.ElementTree import iterparse, parse as parse_xml, Element
+from abc import ABC
+from abc import abstractmethod
+from datetime import datetime
+from typing import List, Tuple, Union, Any, Optional, Iterator, Dict, Callable, Sequence, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from openpyxl.worksheet.worksheet import Worksheet
+
+
+class SheetData:
+    def __init__(self, title: str, rows: List[tuple]):
+        self.title: str = title
+        self.rows: List[tuple] = rows
+
+    @staticmethod
+    def from_worksheet(sheet: 'Worksheet') -> 'SheetData':
+        return SheetData(sheet.title, list(sheet.iter_rows(values_only=True)))
+
+    def iter_rows(self, values_only: bool = True, min_row: int = 1, max_row: Optional[int] = None,
+                  min_col: int = 1, max_col: Optional[int] = None) -> Iterator[tuple]:
+        assert values_only
+        for row in self.rows[min_row - 1:max_row]:
+            if max_col is None:
+                yield row[min_col - 1:]
+            else:
+                cells = row[min_col - 1:max_col]
+                yield cells + (None,) * (max_col - min_col + 1 - len(cells))
+
+
+class XlsxWorkbook:
+    main_ns = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+    rel_ns = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+    package_rel_ns = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+
+    def __init__(self, file: str):
+        from openpyxl.utils.datetime import WINDOWS_EPOCH, CALENDAR_MAC_1904
+        self.file: str = file
+        # the archive is opened per read and closed right after, so the workbook never keeps the file locked
+        with self.open_archive() as archive:
+            rels = self.read_rels(archive, 'xl/workbook.xml')
+            workbook = self.read_xml(archive, 'xl/workbook.xml')
+            properties = workbook.find(f"{self.main_ns}workbookPr")
+            date1904 = properties is not None and properties.get('date1904', '').lower() in ('1', 'true')
+            self.epoch: datetime = CALENDAR_MAC_1904 if date1904 else WINDOWS_EPOCH
+
+            self.shared_strings: List[str] = []
+            self.date_formats: Dict[int, bool] = {}
+            for rel_type, target in rels.values():
+                if rel_type.endswith('/sharedStrings'):
+                    self.shared_strings = self.read_shared_strings(archive, target)
+                elif rel_type.endswith('/styles'):
+                    self.date_formats = self.read_date_formats(archive, target)
+
+        self.sheets: List[XlsxSheet] = []
+        for sheet in workbook.iter(f"{self.main_ns}sheet"):
+            rel_type, target = rels[sheet.get(f"{self.rel_ns}id")]
+            if rel_type.endswith('/worksheet'):
+                self.sheets.append(XlsxSheet(self, sheet.get('name'), target))
+
+    def open_archive(self) -> zipfile.ZipFile:
+        return zipfile.ZipFile(self.file)
+
+    @staticmethod
+    def read_xml(archive: zipfile.ZipFile, path: str) -> Element:
+        with archive.open(path) as src:
+            return parse_xml(src).getroot()
+
+    def read_rels(self, archive: zipfile.ZipFile, path: str) -> Dict[str, Tuple[str, str]]:
+        folder, name = posixpath.split(path)
+        rels = {}
+        for rel in self.read_xml(archive, f"{folder}/_rels/{name}.rels").iter(f"{self.package_rel_ns}Relationship"):
+            target = rel.get('Target')
+            target = target[1:] if target.startswith('/') else posixpath.normpath(posixpath.join(folder, target))
+            rels[rel.get('Id')] = rel.get('Type'), target
+        return rels
+
+    @staticmethod
+    def text_content(element: Element) -> str:
+        ns = XlsxWorkbook.main_ns
+        if len(element) == 1 and element[0].tag == f"{ns}t":
+            return element[0].text or ''
+        snippets = [element.findtext(f"{ns}t") or '']
+        snippets.extend(t.text or '' for t in element.iterfind(f"{ns}r/{ns}t"))
+        return str.join('', snippets)
+
+    def read_shared_strings(self, archive: zipfile.ZipFile, path: str) -> List[str]:
+        strings = []
+        with archive.open(path) as src:
+            for _, element in iterparse(src):
+                if element.tag == f"{self.main_ns}si":
+                    strings.append(self.text_content(element).replace('x005F_', ''))
+                    element.clear()
+        return strings
+
+    def read_date_formats(self, archive: zipfile.ZipFile, path: str) -> Dict[int, bool]:
+        from openpyxl.styles.numbers import builtin_format_code, is_date_format, is_timedelta_format
+        styles = self.read_xml(archive, path)
+        custom = {int(f.get('numFmtId')): f.get('formatCode') for f in styles.iter(f"{self.main_ns}numFmt")}
+        cell_styles = styles.find(f"{self.main_ns}cellXfs")
+        date_formats = {}
+        for index, style in enumerate([] if cell_styles is None else cell_styles.iterfind(f"{self.main_ns}xf")):
+            format_id = int(style.get('numFmtId', 0))
+            code = custom[format_id] if format_id in custom else builtin_format_code(format_id)
+            if is_date_format(code):
+                date_formats[index] = is_timedelta_format(code)
+        return date_formats
+
+
+class XlsxSheet:
+    def __init__(self, workbook: XlsxWorkbook, title: str, path: str):
+        self.workbook: XlsxWorkbook = workbook
+        self.title: str = title
+        self.path: str = path
+
+    def parse_cell_value(self, cell: Element) -> Any:
+        data_type = cell.get('t', 'n')
+        if data_type == 'inlineStr':
+            child = cell.find(f"{XlsxWorkbook.main_ns}is")
+            return None if child is None else XlsxWorkbook.text_content(child)
+        value = cell.findtext(f"{XlsxWorkbook.main_ns}v") or None
+        if value is None:
+            return None
+        if data_type == 'n':
+            value = float(value) if '.' in value or 'E' in value or 'e' in value else int(value)
+            style = cell.get('s')
+            timedelta = self.workbook.date_formats.get(int(style)) if style else self.workbook.date_formats.get(0)
+            if timedelta is not None:
+                from openpyxl.utils.datetime import from_excel
+                try:
+                    value = from_excel(value, self.workbook.epoch, timedelta=timedelta)
+                except (OverflowError, ValueError):
+                    value = '#VALUE!'
+            return value
+        if data_type == 's':
+            return self.workbook.shared_strings[int(value)]
+        if data_type == 'b':
+            return bool(int(value))
+        if data_type == 'd':
+            from openpyxl.utils.datetime import from_ISO8601
+            return from_ISO8601(value)
+        return value
+
+    @staticmethod
+    def column_index(ref: str) -> int:
+        index = 0
+        for ch in ref:
+            if ch <= '9':
+                break
+            index = index * 26 + ord(ch) - 64
+        return index
+
+    def iter_rows(self, values_only: bool = True, min_row: int = 1, max_row: Optional[int] = None,
+                  min_col: int = 1, max_col: Optional[int] = None) -> Iterator[tuple]:
+        assert values_only
+        ns = XlsxWorkbook.main_ns
+        row_tag, cell_tag = f"{ns}row", f"{ns}c"
+        dimension_tag, data_tag = f"{ns}dimension", f"{ns}sheetData"
+        width = max_col
+        row_index = 0
+        counter = min_row
+        with self.workbook.open_archive() as archive, archive.open(self.path) as src:
+            for _, element in iterparse(src):
+                tag = element.tag
+                if tag == row_tag:
+                    ref = element.get('r')
+                    row_index = int(float(ref)) if ref else row_index + 1
+                    if max_row is not None and row_index > max_row:
+                        break
+                    cells = []
+                    column = 0
+                    for cell in element:
+                        if cell.tag != cell_tag:
+                            continue
+                        ref = cell.get('r')
+                        column = self.column_index(ref) if ref else column + 1
+                        cells.append((column, self.parse_cell_value(cell)))
+                    element.clear()
+                    empty_row = (None,) * (width + 1 - min_col) if width else ()
+                    while counter < row_index:
+                        counter += 1
+                        yield empty_row
+                    if counter > row_index:
+                        continue
+                    counter += 1
+                    if not cells and not width:
+                        yield ()
+                        continue
+                    last = width or cells[-1][0]
+                    values = [None] * (last + 1 - min_col)
+                    for column, value in cells:
+                        if min_col <= column <= last:
+                            values[column - min_col] = value
+                    yield tuple(values)
+                elif tag == dimension_tag:
+                    from openpyxl.utils import range_boundaries
+                    _, _, dimension_col, dimension_row = range_boundaries(element.get('ref'))
+                    width = width or dimension_col
+                    max_row = max_row or dimension_row
+                elif tag == data_tag:
+                    break
+        if max_row is not None and max_row < row_index:
+            empty_row = (None,) * (width + 1 - min_col) if width else ()
+            for _ in range(counter, max_row + 1):
+                yield empty_row
+
+
+class RowSheet(ABC):
+    def __init__(self, title: str, path: str):
+        self.title: str = title
+        self.path: str = path
+
+    @abstractmethod
+    def read_rows(self) -> Iterator[Sequence[Any]]:
+        raise NotImplementedError()
+
+    def iter_rows(self, values_only: bool = True, min_row: int = 1, max_row: Optional[int] = None,
+                  min_col: int = 1, max_col: Optional[int] = None) -> Iterator[tuple]:
+        assert values_only
+        for row in itertools.islice(self.read_rows(), min_row - 1, max_row):
+            cells = tuple(row[min_col - 1:max_col])
+            if max_col is not None and len(cells) < max_col - min_col + 1:
+                cells += (None,) * (max_col - min_col + 1 - len(cells))
+            yield cells
+
+
+class CsvSheet(RowSheet):
+    def __init__(self, title: str, path: str, delimiter: str):
+        super().__init__(title, path)
+        self.delimiter: str = delimiter
+
+    def read_rows(self) -> Iterator[List[Optional[str]]]:
+        with open(self.path, newline='', encoding='utf-8-sig') as f:
+            for row in csv.reader(f, delimiter=self.delimiter):
+                yield [cell if cell != '' else None for cell in row]
+
+
+class JsonLinesSheet(RowSheet):
+
+    def read_rows(self) -> Iterator[List[Any]]:
+        field_names = None
+        with open(self.path, encoding='utf-8-sig') as f:
+            for line in f:
+                if line.strip():
+                    row = JsonSheetReader.to_row(json.loads(line), field_names)
+                    field_names = field_names or row
+                    yield row
+
+
+Sheet = Union['Worksheet', XlsxSheet, RowSheet, SheetData]
+
+
+class SheetReader(ABC):
+
+    @abstractmethod
+    def open_sheets(self, file: str) -> Iterator[Sheet]:
+        raise NotImplementedError()
+
+
+class OpenpyxlSheetReader(SheetReader):
+
+    def open_sheets(self, file: str) -> Iterator['Worksheet']:
+        from openpyxl import load_workbook
+        yield from load_workbook(filename=file, read_only=True, data_only=True)
+
+
+class XlsxSheetReader(SheetReader):
+
+    def open_sheets(self, file: str) -> Iterator[XlsxSheet]:
+        yield from XlsxWorkbook(file).sheets
+
+
+class CsvSheetReader(SheetReader):
+
+    def open_sheets(self, file: str) -> Iterator[CsvSheet]:
+        name, ext = os.path.splitext(os.path.basename(file))
+        yield CsvSheet(name, file, '\t' if ext == '.tsv' else ',')
+
+
+class JsonSheetReader(SheetReader):
+
+    @staticmethod
+    def to_cell(value: Any) -> Any:
+        if isinstance(value, list):
+            return str.join(',', (str(JsonSheetReader.to_cell(v)) for v in value))
+        if isinstance(value, dict):
+            return str.join(',', (f"{k},{JsonSheetReader.to_cell(v)}" for k, v in value.items()))
+        return value
+
+    @staticmethod
+    def to_row(row: Union[list, dict], field_names: Optional[List[Any]]) -> List[Any]:
+        if isinstance(row, dict):
+            if field_names is None:
+                raise Exception('json rows as objects need a header row with field names first')
+            return [JsonSheetReader.to_cell(row.get(name)) for name in field_names]
+        return [JsonSheetReader.to_cell(value) for value in row]
+
+    @staticmethod
+    def to_sheet(title: str, rows: List[Union[list, dict]]) -> SheetData:
+        data = []
+        for row in rows:
+            data.append(tuple(JsonSheetReader.to_row(row, data[0] if data else None)))
+        return SheetData(title, data)
+
+    def open_sheets(self, file: str) -> Iterator[Sheet]:
+        name, ext = os.path.splitext(os.path.basename(file))
+        if ext == '.jsonl':
+            yield JsonLinesSheet(name, file)
+            return
+        with open(file, encoding='utf-8-sig') as f:
+            document = json.load(f)
+        if isinstance(document, dict):
+            for title, rows in document.items():
+                yield self.to_sheet(title, rows)
+        else:
+            yield self.to_sheet(name, document)
+
+
+SHEET_READERS: Dict[str, Callable[[], SheetReader]] = {
+    'openpyxl': OpenpyxlSheetReader,
+    'xlsx': XlsxSheetReader,
+}
+
+SOURCE_READERS: Dict[str, Callable[[], SheetReader]] = {
+    '.csv': CsvSheetReader,
+    '.tsv': CsvSheetReader,
+    '.json': JsonSheetReader,
+    '.jsonl': JsonSheetReader,
+}
+
+# -formats names, only xlsx is read unless others are asked for
+SOURCE_FORMATS: Dict[str, Tuple[str, ...]] = {
+    'xlsx': ('.xlsx',),
+    'csv': ('.csv', '.tsv'),
+    'json': ('.json', '.jsonl'),
+}
@@ -0,0 +1,51 @@
+#!/usr/bin/python
+# -*- coding: UTF-8 -*-
+
+from typing import Dict, Type
+from easy_converter import *
+from easy_to_cs import CSharpWriter
+from easy_to_java import JavaWriter
+from easy_to_cpp import CppWriter
+from easy_to_lua import LuaWriter
+
+WRITERS: Dict[str, Type[TableWriter]] = {
+    'cs': CSharpWriter,
+    'java': JavaWriter,
+    'cpp': CppWriter,
+    'lua': LuaWriter,
+}
+
+
+def target_path(path: str, target: str) -> str:
+    if '{target}' in path:
+        return path.replace('{target}', target)
+    return os.path.join(path, target)
+
+
+def create_writers(targets: List[str], **kwargs) -> List[TableWriter]:
+    writers = []
+    for target in targets:
+        if target not in WRITERS:
+            raise Exception(f"unknown target: {target}, expected one of {','.join(WRITERS)}")
+        options = dict(kwargs)
+        options["out"] = target_path(kwargs["out"], target)
+        if kwargs.get("outdata"):
+            options["outdata"] = target_path(kwargs["outdata"], target)
+        else:
+            options["outdata"] = os.path.join(options["out"], 'data')
+        writers.append(WRITERS[target](**options))
+    return writers
+
+
+if __name__ == '__main__':
+    parser = EasyConverter.create_arg_parser()
+    parser.add_argument("-targets", type=str, default=str.join(',', WRITERS))
+    parser.add_argument("-threads", type=int, default=1)
+    parser.set_defaults(outdata=None)
+    parsed_args = vars(parser.parse_args())
+    targets = [t.strip() for t in parsed_args.pop("targets").split(',') if t.strip()]
+    threads = parsed_args.pop("threads")
+    if len(targets) > 1:
+        parsed_args["stream"] = False
+    reader = TableReader(**parsed_args)
+    EasyConverter.convert_all(reader, create_writers(targets, **parsed_args), threads)
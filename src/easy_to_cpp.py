@@ -6,11 +6,14 @@ from easy_converter import *
 
 
 class CppWriter(TableWriter):
+    output_options = TableWriter.output_options + ('mmap',)
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.source_file_ext = self.get_script_file_ext()
         self.header_file_ext = self.get_header_file_ext()
+        self.mmap: bool = bool(kwargs.get("mmap"))
+        self.env.globals['mmap'] = self.mmap
 
     def get_template_file_dir(self) -> str:
         return "templates/cpp"
@@ -22,13 +25,22 @@ class CppWriter(TableWriter):
             "table_special_str_n": Table.special_str['\n']
         })
 
-        buffer_inc_template = self.env.get_template('buffer_inc_template.j2')
+        buffer_prefix = 'buffer_binary' if self.binary_data else 'buffer_view' if self.mmap else 'buffer'
+        buffer_inc_template = self.env.get_template(f'{buffer_prefix}_inc_template.j2')
         text = buffer_inc_template.render(context)
         self.write_config("DataBuffer" + self.header_file_ext, text)
-        buffer_src_template = self.env.get_template('buffer_src_template.j2')
+        buffer_src_template = self.env.get_template(f'{buffer_prefix}_src_template.j2')
         text = buffer_src_template.render(context)
         self.write_config("DataBuffer" + self.source_file_ext, text)
 
+        if self.mmap:
+            mapped_file_inc_template = self.env.get_template('mapped_file_inc_template.j2')
+            text = mapped_file_inc_template.render(context)
+            self.write_config("MappedFile" + self.header_file_ext, text)
+            mapped_file_src_template = self.env.get_template('mapped_file_src_template.j2')
+            text = mapped_file_src_template.render(context)
+            self.write_config("MappedFile" + self.source_file_ext, text)
+
     def convert_table(self, table: Table, context: Dict[str, Any]):
         assert isinstance(table.scheme, Scheme)
         class_context = {"table": table.scheme}
@@ -43,8 +55,7 @@ class CppWriter(TableWriter):
         text0 = class_src_template.render(class_context)
         self.write_config(f"{table_name}{self.source_file_ext}", text0)
 
-        text1 = self.pack_table_data(table)
-        self.write_config_data(f"{table_name}.txt", text1)
+        self.write_table_data(table)
 
     def convert_manager(self, tables: List[Table], context: Dict[str, Any]) -> None:
         context["tables"] = tables
@@ -64,16 +75,6 @@ class CppWriter(TableWriter):
     def get_display_def(self, field: Field):
         return field.field_def
 
-    def write_all(self, tables):
-        context = {}
-
-        for table in tables:
-            self.convert_table(table, context)
-
-        self.convert_manager(tables, context)
-
-        self.convert_misc(tables, context)
-
 
 if __name__ == '__main__':
     parsed_args = EasyConverter.parse_args()
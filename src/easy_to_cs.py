@@ -1,13 +1,16 @@
 #!/usr/bin/python
 # -*- coding: UTF-8 -*-
-from typing import List, Dict
+from typing import List, Dict, Any
 from easy_converter import *
 
 
 class CSharpWriter(TableWriter):
+    output_options = TableWriter.output_options + ('asyncload',)
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        self.async_load: bool = bool(kwargs.get("asyncload"))
+        self.env.globals['async_load'] = self.async_load
 
     def get_template_file_dir(self) -> str:
         return "templates/cs"
@@ -33,13 +36,19 @@ class CSharpWriter(TableWriter):
             "table_special_str_n": Table.special_str['\n']
         })
 
-        buffer_template = self.env.get_template('buffer_template.j2')
+        if self.accessors:
+            buffer_template = self.env.get_template('buffer_fixed_template.j2')
+            self.write_config("FixedBuffer" + self.file_ext, buffer_template.render(context))
+            return
+
+        buffer_template_name = 'buffer_binary_template.j2' if self.binary_data else 'buffer_template.j2'
+        buffer_template = self.env.get_template(buffer_template_name)
         text = buffer_template.render(context)
         self.write_config("DataBuffer" + self.file_ext, text)
 
     def convert_table(self, table: Table, context: Dict[str, Any]):
         assert isinstance(table.scheme, Scheme)
-        class_template = self.env.get_template('class_template.j2')
+        class_template = self.env.get_template('class_fixed_template.j2' if self.accessors else 'class_template.j2')
         class_context = {"table": table.scheme}
         class_context.update(context)
 
@@ -49,27 +58,22 @@ class CSharpWriter(TableWriter):
 
         self.write_config(f"{table_name}{self.file_ext}", text0)
 
-        text1 = self.pack_table_data(table)
-        self.write_config_data(f"{table_name}.txt", text1)
+        self.write_table_data(table)
 
     def convert_manager(self, tables: List[Table], context: Dict[str, Any]) -> None:
         context["tables"] = tables
-        manager_template = self.env.get_template('manager_template.j2')
+        manager_template = self.env.get_template('manager_fixed_template.j2' if self.accessors else 'manager_template.j2')
         text = manager_template.render(context)
         self.write_config("TableManager" + self.file_ext, text)
 
-    def get_script_file_ext(self):
-        return '.cs'
-
-    def write_all(self, tables):
-        context = {}
+    def supports_accessors(self) -> bool:
+        return True
 
-        for table in tables:
-            self.convert_table(table, context)
+    def get_index_string_key(self, value: str) -> Any:
+        return value.encode('utf-16-be')
 
-        self.convert_manager(tables, context)
-
-        self.convert_misc(tables, context)
+    def get_script_file_ext(self):
+        return '.cs'
 
 
 if __name__ == '__main__':
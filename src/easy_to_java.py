@@ -1,7 +1,7 @@
 #!/usr/bin/python
 # -*- coding: UTF-8 -*-
 
-from typing import List, Dict
+from typing import List, Dict, Any
 from easy_converter import *
 
 
@@ -15,7 +15,7 @@ class JavaWriter(TableWriter):
 
     def convert_table(self, table: Table, context: Dict[str, Any]):
         assert isinstance(table.scheme, Scheme)
-        class_template = self.env.get_template('class_template.j2')
+        class_template = self.env.get_template('class_fixed_template.j2' if self.accessors else 'class_template.j2')
         class_context = {"table": table.scheme}
         class_context.update(context)
 
@@ -25,8 +25,7 @@ class JavaWriter(TableWriter):
 
         self.write_config(f"{table_name}{self.file_ext}", text0)
 
-        text1 = self.pack_table_data(table)
-        self.write_config_data(f"{table_name}.txt", text1)
+        self.write_table_data(table)
 
     def convert_misc(self, tables: List[Table], context: Dict[str, Any]):
         context.update({
@@ -34,32 +33,38 @@ class JavaWriter(TableWriter):
             "table_special_str_n": Table.special_str['\n']
         })
 
-        buffer_template = self.env.get_template('buffer_template.j2')
-        text = buffer_template.render(context)
-        self.write_config("DataBuffer" + self.file_ext, text)
+        if self.accessors:
+            buffer_template = self.env.get_template('buffer_fixed_template.j2')
+            self.write_config("FixedBuffer" + self.file_ext, buffer_template.render(context))
+        else:
+            buffer_template_name = 'buffer_binary_template.j2' if self.binary_data else 'buffer_template.j2'
+            buffer_template = self.env.get_template(buffer_template_name)
+            text = buffer_template.render(context)
+            self.write_config("DataBuffer" + self.file_ext, text)
 
         func_template = self.env.get_template('func_template.j2')
-        text0 = func_template.render(context)
-        self.write_config("FuncStr2Str" + self.file_ext, text0)
+        for func_name, bytes_func in (("FuncStr2Bytes", True), ("FuncStr2Str", False)):
+            if bytes_func == (self.binary_data or self.accessors) or (bytes_func and self.compress):
+                text0 = func_template.render(context, bytes_func=bytes_func)
+                self.write_config(func_name + self.file_ext, text0)
 
     def convert_manager(self, tables: List[Table], context: Dict[str, Any]) -> None:
         context["tables"] = tables
-        manager_template = self.env.get_template('manager_template.j2')
+        manager_template = self.env.get_template('manager_fixed_template.j2' if self.accessors else 'manager_template.j2')
         text = manager_template.render(context)
         self.write_config("TableManager" + self.file_ext, text)
 
-    def get_script_file_ext(self):
-        return '.java'
-
-    def write_all(self, tables):
-        context = {}
+    def supports_accessors(self) -> bool:
+        return True
 
-        for table in tables:
-            self.convert_table(table, context)
+    def get_index_string_key(self, value: str) -> Any:
+        return value.encode('utf-16-be')
 
-        self.convert_manager(tables, context)
+    def get_script_file_ext(self):
+        return '.java'
 
-        self.convert_misc(tables, context)
+    def get_display_def(self, field: Field):
+        return field.field_def
 
 
 if __name__ == '__main__':
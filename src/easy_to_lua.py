@@ -1,25 +1,182 @@
 #!/usr/bin/python
 # -*- coding: UTF-8 -*-
 
+import io
 from typing import Dict
 from easy_converter import *
 
 
+class LuaSharedValues:
+    placeholder = re.compile('\x00(\\d+)\x00')
+
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+        self.literals: List[str] = []
+        self.counts: List[int] = []
+        self.names: Dict[int, str] = {}
+
+    def intern(self, literal: str) -> str:
+        index = self.ids.get(literal)
+        if index is None:
+            index = self.ids[literal] = len(self.literals)
+            self.literals.append(literal)
+            self.counts.append(0)
+            self.count_refs(literal)
+        return f"\x00{index}\x00"
+
+    def count_refs(self, text: str):
+        if '\x00' in text:
+            for match in self.placeholder.finditer(text):
+                self.counts[int(match.group(1))] += 1
+
+    def resolve(self, match: re.Match) -> str:
+        index = int(match.group(1))
+        return self.names.get(index) or self.expand(self.literals[index])
+
+    def expand(self, text: str) -> str:
+        return self.placeholder.sub(self.resolve, text) if '\x00' in text else text
+
+    def define(self, readonly: bool) -> str:
+        lines = []
+        for index, (literal, count) in enumerate(zip(self.literals, self.counts)):
+            if count > 1:
+                name = self.names[index] = f"shared[{len(lines) + 1}]"
+                value = self.expand(literal)
+                lines.append(f"{name} = freeze({value})" if readonly else f"{name} = {value}")
+        return str.join('\n', lines)
+
+
 class LuaWriter(TableWriter):
+    # -compress only applies to data files and the Lua writer writes code modules only
+    output_options = tuple(o for o in TableWriter.output_options if o != 'compress') + ('dedup', 'readonly')
+    keywords = {'and', 'break', 'do', 'else', 'elseif', 'end', 'false', 'for', 'function', 'goto', 'if', 'in',
+                'local', 'nil', 'not', 'or', 'repeat', 'return', 'then', 'true', 'until', 'while'}
+    escapes = {'\\': '\\\\', "'": "\\'", '\n': '\\n', '\r': '\\r'}
+    re_escape = re.compile(r"[\\'\x00-\x1f\x7f]")
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.env.globals['zip'] = zip
+        self.string_pool = None
+        self.dedup: bool = bool(kwargs.get("dedup"))
+        self.readonly: bool = bool(kwargs.get("readonly"))
+        self.lua_version: str = kwargs.get("luaversion") or '5.3'
+        # frozen tables forward # and pairs() through __len and __pairs, which older runtimes ignore
+        if self.readonly and tuple(int(v) for v in self.lua_version.split('.')) < (5, 3):
+            raise Exception(f"-readonly needs Lua 5.3 or later, got -luaversion {self.lua_version}")
+        self.env.globals['string_pool'] = False
+        self.env.globals['readonly'] = self.readonly
 
     def get_template_file_dir(self) -> str:
         return "templates/lua"
 
+    @staticmethod
+    def resolve_field(field: Field) -> Field:
+        while isinstance(field, FieldReference):
+            field = field.ref_type
+        return field
+
+    @staticmethod
+    def escape_char(match: re.Match) -> str:
+        char = match.group()
+        return LuaWriter.escapes.get(char) or f"\\{ord(char):03d}"
+
+    @staticmethod
+    def format_string(token: str) -> str:
+        value = token.replace(Table.special_str['\n'], '\n').replace(Table.special_str['\\,'], ',')
+        return "'" + LuaWriter.re_escape.sub(LuaWriter.escape_char, value) + "'"
+
+    @staticmethod
+    def format_name(token: str) -> str:
+        if token.isascii() and token.isidentifier() and token not in LuaWriter.keywords:
+            return token
+        return f"[{LuaWriter.format_string(token)}]"
+
+    @staticmethod
+    def check_key(value: str) -> str:
+        if value == 'nil':
+            raise ValueError("empty key")
+        return value
+
+    @staticmethod
+    def share_formatter(format_literal: Callable[[Iterator[str]], str],
+                        shared: Optional[LuaSharedValues]) -> Callable[[Iterator[str]], str]:
+        if shared is None:
+            return format_literal
+        return lambda tokens: shared.intern(format_literal(tokens))
+
+    def compile_formatter(self, field: Field, shared: Optional[LuaSharedValues] = None) -> Callable[[Iterator[str]], str]:
+        field = self.resolve_field(field)
+        if isinstance(field, FieldList):
+            format_element = self.compile_formatter(field.list_element_type, shared)
+
+            def format_list(tokens):
+                count = int(next(tokens))
+                return '{' + ','.join([format_element(tokens) for _ in range(count)]) + '}'
+
+            return self.share_formatter(format_list, shared)
+        if isinstance(field, FieldDictionary):
+            key_type = self.resolve_field(field.dict_key_type)
+            format_value = self.compile_formatter(field.dict_value_type, shared)
+            if key_type.field_type == FieldType.Primitive and key_type.field_def == 'string':
+                def format_key(tokens):
+                    return self.format_name(next(tokens))
+            else:
+                format_element = self.compile_formatter(key_type)
+
+                def format_key(tokens):
+                    return f"[{self.check_key(format_element(tokens))}]"
+
+            def format_dict(tokens):
+                count = int(next(tokens))
+                return '{' + ','.join([format_key(tokens) + '=' + format_value(tokens) for _ in range(count)]) + '}'
+
+            return self.share_formatter(format_dict, shared)
+        if isinstance(field, FieldStruct):
+            formatters = [(f.field_name + '=', self.compile_formatter(f, shared)) for f in field.struct_fields]
+
+            def format_struct(tokens):
+                return '{' + ','.join([name + format_field(tokens) for name, format_field in formatters]) + '}'
+
+            return self.share_formatter(format_struct, shared)
+        if field.field_def == 'string':
+            return lambda tokens: self.format_string(next(tokens))
+        if field.field_def == 'bool':
+            return lambda tokens: 'true' if next(tokens).lower() == 'true' else 'false'
+        return lambda tokens: next(tokens) or 'nil'
+
+    def format_rows(self, table: Table) -> Tuple[str, str]:
+        fields = table.scheme.fields
+        shared = LuaSharedValues() if self.dedup else None
+        formatters = [self.compile_formatter(field, shared) for field in fields]
+        format_id = formatters[0]
+        formatters[0] = lambda tokens: self.check_key(format_id(tokens))
+        names = [field.field_name + '=' for field in fields]
+        out = io.StringIO()
+        for index, row in enumerate(table.iter_rows()):
+            values = []
+            for format_field, cell, field in zip(formatters, row, fields):
+                try:
+                    values.append(format_field(iter(cell.split(','))))
+                except (ValueError, StopIteration) as e:
+                    print(f"error in encoding: {field.table_name},{field.field_name},{cell}")
+                    raise e
+            if index:
+                out.write(',\n')
+            out.write(f"            [{values[0]}] = {{{','.join([name + value for name, value in zip(names, values)])}}}")
+        if shared is None:
+            return '', out.getvalue()
+        rows = out.getvalue()
+        shared.count_refs(rows)
+        return shared.define(self.readonly), shared.expand(rows)
+
     def convert_table(self, table: Table, context: Dict[str, Any]):
         assert isinstance(table.scheme, Scheme)
         class_template = self.env.get_template('class_template.j2')
+        shared, rows = self.format_rows(table)
         class_context = {
             "table": table.scheme,
-            "data": table.data,
+            "shared": shared,
+            "rows": rows,
         }
         class_context.update(context)
 
@@ -43,15 +200,8 @@ class LuaWriter(TableWriter):
     def get_script_file_ext(self):
         return '.lua'
 
-    def write_all(self, tables):
-        context = {}
-
-        for table in tables:
-            self.convert_table(table, context)
-
-        self.convert_manager(tables, context)
-
-        self.convert_misc(tables, context)
+    def get_display_def(self, field: Field):
+        return field.field_def
 
 
 if __name__ == '__main__':
@@ -0,0 +1,49 @@
+#include <deque>
+#include <fstream>
+#include <iostream>
+#include <string>
+#include "MappedFile.hpp"
+
+using EasyConverter::MappedFile;
+
+// Maps the file given on the command line repeatedly the way TableManager::LoadData
+// does on reload and prints how many mappings of it are still alive after each step.
+static int CountMappings(const std::string& path)
+{
+    std::ifstream maps("/proc/self/maps");
+    int count = 0;
+    for (std::string line; std::getline(maps, line);)
+    {
+        if (line.size() >= path.size() && line.compare(line.size() - path.size(), path.size(), path) == 0)
+        {
+            ++count;
+        }
+    }
+    return count;
+}
+
+int main(int argc, char** argv)
+{
+    std::string path = argv[1];
+    std::deque<MappedFile> mappedFiles;
+    for (int load = 0; load < 3; ++load)
+    {
+        mappedFiles.clear();
+        for (int i = 0; i < 4; ++i)
+        {
+            std::string_view view = mappedFiles.emplace_back(MappedFile::Map(path)).View();
+            if (view != "mapped")
+            {
+                std::cout << "content " << view << std::endl;
+                return 1;
+            }
+        }
+        std::cout << "load " << CountMappings(path) << std::endl;
+    }
+    MappedFile moved = std::move(mappedFiles.front());
+    mappedFiles.clear();
+    std::cout << "moved " << CountMappings(path) << " " << moved.View() << std::endl;
+    moved = MappedFile(std::string("owned"));
+    std::cout << "released " << CountMappings(path) << " " << moved.View() << std::endl;
+    return 0;
+}
@@ -0,0 +1,159 @@
+#include <algorithm>
+#include <fstream>
+#include <iomanip>
+#include <iostream>
+#include <iterator>
+#include <sstream>
+#include <stdexcept>
+#include <string>
+#include <string_view>
+#include <type_traits>
+#include <unordered_map>
+#include <vector>
+#include "Item.hpp"
+#include "Shop.hpp"
+#include "TableManager.hpp"
+
+using namespace EasyConverter;
+
+// Loads the tables of tests/test_round_trip.py from the data directory given on the command
+// line and prints every row through GetAll, sorted, followed by one lookup line per table
+// counting the rows that Get returns unchanged and whether a missing key throws.
+static std::string Dump(int value)
+{
+    return std::to_string(value);
+}
+
+static std::string Dump(long value)
+{
+    return std::to_string(value);
+}
+
+static std::string Dump(bool value)
+{
+    return value ? "true" : "false";
+}
+
+static std::string Dump(float value)
+{
+    std::ostringstream stream;
+    stream << std::setprecision(9) << value;
+    return stream.str();
+}
+
+static std::string Dump(std::string_view value)
+{
+    std::string result = "'";
+    for (char c : value)
+    {
+        result += c == '\n' ? std::string("\\n") : std::string(1, c);
+    }
+    return result + "'";
+}
+
+template <typename T, typename = std::enable_if_t<std::is_enum_v<T>>>
+static std::string Dump(T value)
+{
+    return std::to_string(static_cast<int>(value));
+}
+
+static std::string Dump(const Item::Extra& value)
+{
+    return "(" + Dump(value.a) + "," + Dump(value.b) + ")";
+}
+
+static std::string Dump(const Shop::Part& value)
+{
+    return "(" + Dump(value.pid) + "," + Dump(value.label) + ")";
+}
+
+static std::string Dump(const Shop::Pos& value)
+{
+    return "(" + Dump(value.x) + "," + Dump(value.y) + ")";
+}
+
+template <typename T>
+static std::string Dump(const std::vector<T>& values)
+{
+    std::string result;
+    for (const auto& value : values)
+    {
+        result += (result.empty() ? "" : ",") + Dump(value);
+    }
+    return "[" + result + "]";
+}
+
+template <typename K, typename V>
+static std::string Dump(const std::unordered_map<K, V>& values)
+{
+    std::vector<std::string> entries;
+    for (const auto& entry : values)
+    {
+        entries.push_back(Dump(entry.first) + ":" + Dump(entry.second));
+    }
+    std::sort(entries.begin(), entries.end());
+    std::string result;
+    for (const auto& entry : entries)
+    {
+        result += (result.empty() ? "" : ",") + entry;
+    }
+    return "{" + result + "}";
+}
+
+static std::string Dump(const Item& row)
+{
+    return Dump(row.id) + "|" + Dump(row.name) + "|" + Dump(row.price) + "|" + Dump(row.weight) + "|" + Dump(row.usable)
+        + "|" + Dump(row.kind) + "|" + Dump(row.extra) + "|" + Dump(row.tags) + "|" + Dump(row.stock);
+}
+
+static std::string Dump(const Shop& row)
+{
+    return Dump(row.code) + "|" + Dump(row.item) + "|" + Dump(row.items) + "|" + Dump(row.item_kind) + "|" + Dump(row.parts)
+        + "|" + Dump(row.slots) + "|" + Dump(row.prices) + "|" + Dump(row.kinds) + "|" + Dump(row.pos);
+}
+
+template <typename K, typename T, typename Get>
+static void Report(const std::string& name, const std::unordered_map<K, T>& rows, Get get, K missing)
+{
+    std::vector<std::string> lines;
+    int ok = 0;
+    int bad = 0;
+    for (const auto& row : rows)
+    {
+        lines.push_back(Dump(row.second));
+        (Dump(get(row.first)) == lines.back() ? ok : bad)++;
+    }
+    std::sort(lines.begin(), lines.end());
+    for (const auto& line : lines)
+    {
+        std::cout << name << " " << line << std::endl;
+    }
+    bool threw = false;
+    try
+    {
+        get(missing);
+    }
+    catch (const std::out_of_range&)
+    {
+        threw = true;
+    }
+    std::cout << name << " lookup ok=" << ok << " bad=" << bad << " missing=" << (threw ? "threw" : "found") << std::endl;
+}
+
+int main(int argc, char** argv)
+{
+    std::string dataDir = argv[1];
+    std::string ext = argv[2];
+#ifdef MAPPED
+    TableManager::LoadData([&](std::string name) { return MappedFile::Map(dataDir + "/" + name + ext); });
+#else
+    TableManager::LoadData([&](std::string name)
+    {
+        std::ifstream file(dataDir + "/" + name + ext, std::ios::binary);
+        return std::string(std::istreambuf_iterator<char>(file), std::istreambuf_iterator<char>());
+    });
+#endif
+    Report("Item", TableManager::GetAllItems(), TableManager::GetItem, 12345);
+    Report("Shop", TableManager::GetAllShops(), TableManager::GetShop, decltype(Shop::code)("missing"));
+    return 0;
+}
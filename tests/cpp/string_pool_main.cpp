@@ -0,0 +1,35 @@
+#include <iostream>
+#include <stdexcept>
+#include <string>
+#include "DataBuffer.hpp"
+
+using EasyConverter::DataBuffer;
+
+// Reads one pooled string from each row given to the text DataBuffer and prints
+// either the string or the kind of exception the lookup raised.
+static void Read(const std::string& row)
+{
+    DataBuffer buffer(row);
+    try
+    {
+        std::cout << buffer.ReadString() << std::endl;
+    }
+    catch (const std::out_of_range&)
+    {
+        std::cout << "out_of_range" << std::endl;
+    }
+    catch (const std::invalid_argument&)
+    {
+        std::cout << "invalid_argument" << std::endl;
+    }
+}
+
+int main()
+{
+    DataBuffer::LoadStrings("zero\r\none\ntwo");
+    for (const char* row : {"1,", "2", "3,", "1x,", "-1,", ",", ""})
+    {
+        Read(row);
+    }
+    return 0;
+}
@@ -0,0 +1,156 @@
+using System;
+using System.Collections;
+using System.Collections.Generic;
+using System.Globalization;
+using System.IO;
+using System.Linq;
+using System.Reflection;
+using System.Threading.Tasks;
+using EasyConverter;
+
+// Loads the generated tables, prints every row returned by GetAll and then checks
+// that Get returns the same row for each key, after a fresh LoadData for lazy managers.
+public static class Program
+{
+    private static string Dump(object value)
+    {
+        if (value == null)
+        {
+            return "null";
+        }
+        if (value is string str)
+        {
+            return "'" + str.Replace("\\", "\\\\").Replace("\n", "\\n").Replace("\r", "\\r") + "'";
+        }
+        // dictionaries and the -accessors maps both enumerate KeyValuePair entries
+        if (value is IEnumerable pairs && IsMap(value.GetType()))
+        {
+            var entries = new List<string>();
+            foreach (var entry in pairs)
+            {
+                var pair = entry.GetType();
+                entries.Add(Dump(pair.GetProperty("Key").GetValue(entry)) + ":" + Dump(pair.GetProperty("Value").GetValue(entry)));
+            }
+            entries.Sort(StringComparer.Ordinal);
+            return "{" + string.Join(",", entries) + "}";
+        }
+        if (value is IEnumerable list)
+        {
+            return "[" + string.Join(",", list.Cast<object>().Select(Dump)) + "]";
+        }
+        var type = value.GetType();
+        if (type.IsPrimitive || type.IsEnum)
+        {
+            return Convert.ToString(value, CultureInfo.InvariantCulture);
+        }
+        var fields = type.GetFields(BindingFlags.Public | BindingFlags.Instance).Select(f => f.Name + "=" + Dump(f.GetValue(value)));
+        var properties = type.GetProperties(BindingFlags.Public | BindingFlags.Instance)
+            .Where(p => p.GetIndexParameters().Length == 0)
+            .Select(p => p.Name + "=" + Dump(p.GetValue(value)));
+        return type.Name + "(" + string.Join(",", fields.Concat(properties)) + ")";
+    }
+
+    private static bool IsMap(Type type)
+    {
+        return type.GetInterfaces().Any(i => i.IsGenericType && i.GetGenericTypeDefinition() == typeof(IEnumerable<>)
+            && i.GetGenericArguments()[0].IsGenericType
+            && i.GetGenericArguments()[0].GetGenericTypeDefinition() == typeof(KeyValuePair<,>));
+    }
+
+    private static object KeyOf(object row)
+    {
+        var type = row.GetType();
+        var field = type.GetFields(BindingFlags.Public | BindingFlags.Instance).FirstOrDefault();
+        return field != null ? field.GetValue(row) : type.GetProperties(BindingFlags.Public | BindingFlags.Instance)[0].GetValue(row);
+    }
+
+    private static string PathOf(string dataDir, string name)
+    {
+        var bytes = Path.Combine(dataDir, name + ".bytes");
+        return File.Exists(bytes) ? bytes : Path.Combine(dataDir, name + ".txt");
+    }
+
+    private static void Load(string dataDir, bool async)
+    {
+        var load = typeof(TableManager).GetMethods(BindingFlags.Public | BindingFlags.Static)
+            .First(m => m.Name == (async ? "LoadDataAsync" : "LoadData"));
+        var parameters = load.GetParameters();
+        var type = parameters[0].ParameterType;
+        object provider;
+        if (type == typeof(Func<string, string>))
+        {
+            provider = (Func<string, string>)(name => File.ReadAllText(PathOf(dataDir, name)));
+        }
+        else if (type == typeof(Func<string, byte[]>))
+        {
+            provider = (Func<string, byte[]>)(name => File.ReadAllBytes(PathOf(dataDir, name)));
+        }
+        else if (type == typeof(Func<string, Task<string>>))
+        {
+            provider = (Func<string, Task<string>>)(name => File.ReadAllTextAsync(PathOf(dataDir, name)));
+        }
+        else if (type == typeof(Func<string, Task<byte[]>>))
+        {
+            provider = (Func<string, Task<byte[]>>)(name => File.ReadAllBytesAsync(PathOf(dataDir, name)));
+        }
+        else
+        {
+            throw new NotSupportedException(type.ToString());
+        }
+        var arguments = new[] { provider }.Concat(parameters.Skip(1).Select(p => p.DefaultValue)).ToArray();
+        if (load.Invoke(null, arguments) is Task task)
+        {
+            task.Wait();
+        }
+    }
+
+    public static void Main(string[] args)
+    {
+        var dataDir = args[0];
+        var async = args.Length > 1 && args[1] == "async";
+        var methods = typeof(TableManager).GetMethods(BindingFlags.Public | BindingFlags.Static);
+        var tables = new List<(MethodInfo get, string name, List<object> keys, List<string> rows)>();
+
+        Load(dataDir, async);
+        foreach (var getAll in methods.Where(m => m.Name.StartsWith("GetAll")).OrderBy(m => m.Name, StringComparer.Ordinal))
+        {
+            var rowType = getAll.ReturnType.GetGenericArguments().Last();
+            var get = methods.First(m => m.Name.StartsWith("Get") && !m.Name.StartsWith("GetAll") && m.ReturnType == rowType
+                && m.GetParameters().Length == 1);
+            var all = getAll.Invoke(null, null);
+            // -accessors returns the rows themselves, keyed by their first member
+            var entries = all is IDictionary dict
+                ? dict.Keys.Cast<object>().Select(key => (key, row: dict[key])).ToList()
+                : ((IEnumerable)all).Cast<object>().Select(row => (key: KeyOf(row), row)).ToList();
+            var keys = entries.Select(entry => entry.key).ToList();
+            var rows = entries.Select(entry => Dump(entry.row)).ToList();
+            tables.Add((get, getAll.Name, keys, rows));
+            foreach (var row in rows.OrderBy(row => row, StringComparer.Ordinal))
+            {
+                Console.WriteLine(getAll.Name + " " + row);
+            }
+        }
+
+        // non-lazy managers keep their tables and cannot be loaded twice
+        if (typeof(TableManager).GetField("dataProvider", BindingFlags.NonPublic | BindingFlags.Static) != null)
+        {
+            Load(dataDir, async);
+        }
+        foreach (var (get, name, keys, rows) in tables)
+        {
+            int ok = 0, bad = 0;
+            for (int i = 0; i < keys.Count; ++i)
+            {
+                if (Dump(get.Invoke(null, new[] { keys[i] })) == rows[i])
+                {
+                    ++ok;
+                }
+                else
+                {
+                    ++bad;
+                }
+            }
+            Console.WriteLine(name + " lookup ok=" + ok + " bad=" + bad);
+        }
+    }
+}
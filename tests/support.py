@@ -0,0 +1,258 @@
+import gzip
+import json
+import os
+import shutil
+import struct
+import subprocess
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type
+
+import openpyxl
+import pytest
+
+from easy_converter import EasyConverter, TableReader, TableWriter, Field, FieldType, FieldReference, CellData, \
+    FixedLayoutEncoder
+
+CSHARP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'csharp')
+CPP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cpp')
+
+CSHARP_PROJECT = """<Project Sdk="Microsoft.NET.Sdk">
+  <PropertyGroup>
+    <OutputType>Exe</OutputType>
+    <TargetFramework>net8.0</TargetFramework>
+    <Nullable>disable</Nullable>
+    <ImplicitUsings>disable</ImplicitUsings>
+    <EnableDefaultCompileItems>false</EnableDefaultCompileItems>
+  </PropertyGroup>
+  <ItemGroup>
+    <Compile Include="{gen}/*.cs" />
+    <Compile Include="{program}" />
+  </ItemGroup>
+</Project>
+"""
+
+
+def write_workbook(path: str, sheets: Dict[str, Sequence[Sequence[Any]]]) -> str:
+    workbook = openpyxl.Workbook()
+    workbook.remove(workbook.active)
+    for title, rows in sheets.items():
+        sheet = workbook.create_sheet(title)
+        for row in rows:
+            sheet.append(list(row))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    workbook.save(path)
+    return path
+
+
+def write_json(path: str, sheets: Dict[str, Sequence[Sequence[Any]]]) -> str:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf8') as f:
+        json.dump({title: [list(row) for row in rows] for title, rows in sheets.items()}, f, ensure_ascii=False)
+    return path
+
+
+def convert(writer_type: Type[TableWriter], source: str, out: str, **options) -> str:
+    options = dict(source=source, out=out, outdata=os.path.join(out, 'data'), **options)
+    EasyConverter.convert(TableReader(**options), writer_type(**options))
+    return out
+
+
+def to_float32(value: float) -> float:
+    return struct.unpack('<f', struct.pack('<f', value))[0]
+
+
+def read_data(path: str, compress: bool = False) -> bytes:
+    with open(path, 'rb') as f:
+        data = f.read()
+    return gzip.decompress(data) if compress else data
+
+
+def decode_field(field: Field, reader) -> Any:
+    """Decodes one field from a text or binary reader into plain Python values.
+
+    Structs become tuples and dictionaries become lists of pairs, so rows decoded from
+    different formats compare equal only if they carry the same values in the same order.
+    """
+    while isinstance(field, FieldReference):
+        field = field.ref_type
+    if field.field_type == FieldType.Primitive:
+        return reader.read_primitive(field.field_def)
+    if field.field_type == FieldType.Enum:
+        return reader.read_int()
+    if field.field_type == FieldType.Struct:
+        return tuple(decode_field(f, reader) for f in field.struct_fields)
+    count = reader.read_int()
+    if field.field_type == FieldType.List:
+        return [decode_field(field.list_element_type, reader) for _ in range(count)]
+    return [(decode_field(field.dict_key_type, reader), decode_field(field.dict_value_type, reader)) for _ in range(count)]
+
+
+def decode_row(fields: List[Field], reader) -> tuple:
+    return tuple(decode_field(field, reader) for field in fields)
+
+
+class TextReader:
+    def __init__(self, line: str, strings: Optional[List[str]] = None):
+        self.tokens = iter(line.split(','))
+        self.strings = strings
+
+    def read_int(self) -> int:
+        return int(next(self.tokens))
+
+    def read_primitive(self, field_def: str) -> Any:
+        token = next(self.tokens)
+        if field_def == 'int' or field_def == 'long':
+            return int(token)
+        if field_def == 'float':
+            return to_float32(float(token))
+        if field_def == 'bool':
+            return token.lower() == 'true'
+        if self.strings is not None:
+            token = self.strings[int(token)]
+        return CellData.from_safe_str(token)
+
+
+class FixedReader:
+    """Reads the -accessors layout: fixed-size slots per record, with strings, structs and collections on the heap."""
+
+    def __init__(self, data: bytes, position: int = 0):
+        self.data = data
+        self.position = position
+
+    def unpack(self, fmt: str) -> Any:
+        value, = struct.unpack_from(fmt, self.data, self.position)
+        self.position += struct.calcsize(fmt)
+        return value
+
+    def read_value(self, field: Field) -> Any:
+        field = FixedLayoutEncoder.resolve_field(field)
+        if field.field_type == FieldType.Primitive and field.field_def != 'string':
+            return self.unpack(FixedLayoutEncoder.slot_formats[field.field_def])
+        if field.field_type == FieldType.Enum:
+            return self.unpack('<i')
+        heap = FixedReader(self.data, self.unpack('<i'))
+        if field.field_type == FieldType.Primitive:
+            length = heap.unpack('<i')
+            return CellData.from_safe_str(self.data[heap.position:heap.position + length].decode('utf8'))
+        if field.field_type == FieldType.Struct:
+            return tuple(heap.read_value(f) for f in field.struct_fields)
+        count = heap.unpack('<i')
+        if field.field_type == FieldType.List:
+            return [heap.read_value(field.list_element_type) for _ in range(count)]
+        return [(heap.read_value(field.dict_key_type), heap.read_value(field.dict_value_type)) for _ in range(count)]
+
+    def read_table(self, fields: List[Field]) -> List[tuple]:
+        offsets = [self.unpack('<i') for _ in range(self.unpack('<i'))]
+        return [tuple(FixedReader(self.data, offset).read_record(fields)) for offset in offsets]
+
+    def read_record(self, fields: List[Field]) -> List[Any]:
+        return [self.read_value(field) for field in fields]
+
+
+class BinaryReader:
+    def __init__(self, data: bytes, position: int = 0, strings: Optional[List[str]] = None):
+        self.data = data
+        self.position = position
+        self.strings = strings
+
+    def read_varint(self) -> int:
+        value, shift = 0, 0
+        while True:
+            byte = self.data[self.position]
+            self.position += 1
+            value |= (byte & 0x7f) << shift
+            shift += 7
+            if byte < 0x80:
+                return value
+
+    def read_int(self) -> int:
+        value = self.read_varint()
+        return (value >> 1) ^ -(value & 1)
+
+    def read_float(self) -> float:
+        value, = struct.unpack_from('<f', self.data, self.position)
+        self.position += 4
+        return value
+
+    def read_bool(self) -> bool:
+        self.position += 1
+        return self.data[self.position - 1] != 0
+
+    def read_strings(self) -> List[str]:
+        strings = []
+        for _ in range(self.read_int()):
+            length = self.read_int()
+            strings.append(self.data[self.position:self.position + length].decode('utf8'))
+            self.position += length
+        return strings
+
+    def read_primitive(self, field_def: str) -> Any:
+        if field_def == 'int' or field_def == 'long':
+            return self.read_int()
+        if field_def == 'float':
+            return self.read_float()
+        if field_def == 'bool':
+            return self.read_bool()
+        return self.strings[self.read_varint()]
+
+    def read_key(self, field_def: str, strings: List[str]) -> Any:
+        if field_def == 'string':
+            return strings[self.read_varint()]
+        if field_def == 'float':
+            return self.read_float()
+        if field_def == 'bool':
+            return self.read_bool()
+        return self.read_int()
+
+
+def read_binary_index(path: str, field_def: str, strings: Optional[List[str]] = None,
+                      compress: bool = False) -> List[Tuple[Any, int, int]]:
+    reader = BinaryReader(read_data(path, compress))
+    if strings is None:
+        strings = reader.read_strings()
+    return [(reader.read_key(field_def, strings), reader.read_int(), reader.read_int()) for _ in range(reader.read_int())]
+
+
+def read_text_index(path: str, compress: bool = False) -> List[Tuple[str, int, int]]:
+    lines = read_data(path, compress).decode('utf8').split('\n')
+    entries = []
+    for line in lines:
+        key, offset, length = line.rsplit(',', 2)
+        entries.append((key, int(offset), int(length)))
+    return entries
+
+
+def requires_dotnet():
+    return pytest.mark.skipif(shutil.which('dotnet') is None, reason="dotnet is not installed")
+
+
+def requires_gxx():
+    return pytest.mark.skipif(shutil.which('g++') is None, reason="g++ is not installed")
+
+
+def run_csharp(gen_dir: str, work_dir: str, mode: str = 'sync') -> Dict[str, List[str]]:
+    """Builds the generated C# code with tests/csharp/Program.cs and returns its report grouped by table.
+
+    Each table maps to its rows dumped through GetAll, followed by one 'lookup' line
+    counting the rows that Get returns unchanged after a fresh LoadData.
+    """
+    os.makedirs(work_dir, exist_ok=True)
+    with open(os.path.join(work_dir, 'App.csproj'), 'w') as f:
+        f.write(CSHARP_PROJECT.format(gen=os.path.abspath(gen_dir), program=os.path.join(CSHARP_DIR, 'Program.cs')))
+    env = dict(os.environ, DOTNET_CLI_TELEMETRY_OPTOUT='1', DOTNET_NOLOGO='1')
+    result = subprocess.run(['dotnet', 'run', '--project', work_dir, '--', os.path.join(gen_dir, 'data'), mode],
+                            capture_output=True, text=True, env=env, timeout=600)
+    assert result.returncode == 0, result.stdout + result.stderr
+    report: Dict[str, List[str]] = {}
+    for line in result.stdout.splitlines():
+        if line:
+            table, _, text = line.partition(' ')
+            report.setdefault(table, []).append(text)
+    return report
+
+
+def assert_lookups(report: Dict[str, List[str]], row_counts: Optional[Dict[str, int]] = None):
+    for table, lines in report.items():
+        rows = len(lines) - 1
+        assert lines[-1] == f"lookup ok={rows} bad=0", table
+        if row_counts is not None:
+            assert rows == row_counts[table], table
@@ -0,0 +1,37 @@
+import os
+
+from easy_converter import EasyConverter, TableReader, Table
+from easy_to_all import create_writers
+from support import write_workbook
+
+SHEETS = {
+    'Item': [('id', 'name'), ('int', 'string'), (1, 'sword'), (2, 'shield')],
+    'Shop': [('code', 'item'), ('string', '@Item,id'), ('apple', 1), ('banana', 2)],
+}
+
+
+def read_tree(root):
+    files = {}
+    for directory, _, names in os.walk(root):
+        for name in names:
+            path = os.path.join(directory, name)
+            with open(path, 'rb') as f:
+                files[os.path.relpath(path, root)] = f.read()
+    return files
+
+
+def convert_all(source, out, threads, **options):
+    reader = TableReader(source=source, **options)
+    EasyConverter.convert_all(reader, create_writers(['cs', 'java', 'cpp'], out=out, **options), threads)
+    return read_tree(out)
+
+
+def test_threaded_writers_read_each_cached_table_once(tmp_path, monkeypatch):
+    source = os.path.dirname(write_workbook(str(tmp_path / 'source' / 'kinds.xlsx'), SHEETS))
+    expected = convert_all(source, str(tmp_path / 'sequential'), 1)
+
+    streamed = []
+    stream_table_data = Table.stream_table_data
+    monkeypatch.setattr(Table, 'stream_table_data', lambda self: streamed.append(self.name) or stream_table_data(self))
+    assert convert_all(source, str(tmp_path / 'threaded'), 3, cache=str(tmp_path / 'cache')) == expected
+    assert sorted(streamed) == ['Item', 'Shop']
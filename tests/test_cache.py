@@ -0,0 +1,104 @@
+import os
+
+import pytest
+
+from easy_to_cs import CSharpWriter
+from easy_to_lua import LuaWriter
+from support import convert, write_workbook
+
+ITEMS = [
+    ('id', 'name', 'tags', 'kind'),
+    ('int', 'string', 'List<string>', 'Enum<Common,1,Rare,2>'),
+    (1, 'sword', 'sharp,steel', 'Common'),
+    (2, 'Line1\nLine2', 'steel', 'Rare'),
+]
+
+SHOPS = [
+    ('code', 'item', 'price'),
+    ('string', '@Item,id', 'float'),
+    ('apple', 1, 1.5),
+    ('banana', 2, 0.25),
+]
+
+
+def read_tree(root):
+    files = {}
+    for directory, _, names in os.walk(root):
+        for name in names:
+            path = os.path.join(directory, name)
+            with open(path, 'rb') as f:
+                files[os.path.relpath(path, root)] = f.read()
+    return files
+
+
+def write_source(path):
+    write_workbook(os.path.join(path, 'items.xlsx'), {'Item': ITEMS})
+    write_workbook(os.path.join(path, 'shops.xlsx'), {'Shop': SHOPS})
+    return path
+
+
+@pytest.mark.parametrize('options', [
+    dict(),
+    dict(dataformat='both', index=True, stringpool=True),
+], ids=['text', 'binary-stringpool'])
+def test_cached_runs_match_a_clean_conversion(tmp_path, capsys, options):
+    source = write_source(str(tmp_path / 'source'))
+    cache = str(tmp_path / 'cache')
+    expected = read_tree(convert(CSharpWriter, source, str(tmp_path / 'clean'), **options))
+
+    convert(CSharpWriter, source, str(tmp_path / 'out'), cache=cache, **options)
+    assert read_tree(str(tmp_path / 'out')) == expected
+    capsys.readouterr()
+
+    convert(CSharpWriter, source, str(tmp_path / 'out'), cache=cache, **options)
+    assert read_tree(str(tmp_path / 'out')) == expected
+    out = capsys.readouterr().out
+    assert "cached items.xlsx:[Item]" in out and "cached shops.xlsx:[Shop]" in out
+    assert "reading" not in out
+
+
+def test_edited_workbook_is_read_again(tmp_path, capsys):
+    source = write_source(str(tmp_path / 'source'))
+    cache = str(tmp_path / 'cache')
+    convert(CSharpWriter, source, str(tmp_path / 'out'), cache=cache)
+    capsys.readouterr()
+
+    items = ITEMS[:3] + [(2, 'edited', 'steel,wood', 'Common'), (3, 'new', None, 'Rare')]
+    write_workbook(os.path.join(source, 'items.xlsx'), {'Item': items})
+    # a newer mtime alone falls back to the content hash and keeps the cached sheets
+    os.utime(os.path.join(source, 'shops.xlsx'), ns=(0, os.stat(os.path.join(source, 'shops.xlsx')).st_mtime_ns + 10 ** 9))
+    convert(CSharpWriter, source, str(tmp_path / 'out'), cache=cache)
+    out = capsys.readouterr().out
+    assert "reading items.xlsx:[Item]" in out
+    assert "cached shops.xlsx:[Shop]" in out
+
+    clean = read_tree(convert(CSharpWriter, source, str(tmp_path / 'clean')))
+    assert read_tree(str(tmp_path / 'out')) == clean
+    with open(os.path.join(tmp_path, 'out', 'data', 'Item.txt'), encoding='utf8') as f:
+        assert 'edited' in f.read()
+
+
+def test_cache_is_kept_per_writer(tmp_path):
+    source = write_source(str(tmp_path / 'source'))
+    cache = str(tmp_path / 'cache')
+    convert(CSharpWriter, source, str(tmp_path / 'cs'), cache=cache)
+    cached = read_tree(convert(LuaWriter, source, str(tmp_path / 'lua'), cache=cache))
+    clean = read_tree(convert(LuaWriter, source, str(tmp_path / 'clean')))
+    # the Lua manager embeds the absolute data path
+    assert cached.pop('TableManager.lua') and clean.pop('TableManager.lua')
+    assert cached == clean
+
+
+def test_cache_key_ignores_options_that_do_not_change_output(tmp_path, monkeypatch):
+    source = write_source(str(tmp_path / 'source'))
+    cache = str(tmp_path / 'cache')
+    out = str(tmp_path / 'out')
+    convert(CSharpWriter, source, out, cache=cache)
+    converted = []
+    convert_table = CSharpWriter.convert_table
+    monkeypatch.setattr(CSharpWriter, 'convert_table',
+                        lambda self, table, context: converted.append(table.name) or convert_table(self, table, context))
+    convert(CSharpWriter, source, out, cache=cache, jobs=2, profile=str(tmp_path / 'profile.json'), prune=True)
+    assert converted == []
+    convert(CSharpWriter, source, out, cache=cache, dataformat='both')
+    assert sorted(converted) == ['Item', 'Shop']
@@ -0,0 +1,105 @@
+import os
+
+import pytest
+
+from easy_to_lua import LuaWriter
+from support import convert, write_json
+
+lupa = pytest.importorskip('lupa')
+
+STRINGS = ["plain", "it's", "back\\slash", "a\\,b", "Line1\nLine2", "crlf\r\nend", "tab\there", "nul\x00bell\x07",
+           "quote\\'", "Ünïcødé 名字", "]]", ""]
+
+
+def load_table(out, name):
+    with open(os.path.join(out, f"{name}.lua"), encoding='utf8') as f:
+        return lupa.LuaRuntime().execute(f.read())
+
+
+def to_python(value):
+    if lupa.lua_type(value) == 'table':
+        return {k: to_python(v) for k, v in value.items()}
+    return value
+
+
+@pytest.fixture
+def source(tmp_path):
+    write_json(str(tmp_path / 'source' / 'lua.json'), {
+        'Text': [
+            ('id', 'name', 'tags', 'attrs'),
+            ('int', 'string', 'List<string>', 'Map<string,int>'),
+        ] + [(i + 1, s, None, None) for i, s in enumerate(STRINGS)] + [
+            (100, 'keys', 'x,it\'s', 'end,1,nil,2,名,3,ok,4'),
+        ],
+    })
+    return str(tmp_path / 'source')
+
+
+@pytest.mark.parametrize('options', [{}, dict(dedup=True)], ids=['plain', 'dedup'])
+def test_strings_round_trip(source, tmp_path, options):
+    rows = load_table(convert(LuaWriter, source, str(tmp_path / 'out'), formats='json', **options), 'Text')
+    for i, s in enumerate(STRINGS):
+        assert rows[i + 1]['name'] == s.replace('\\,', ',')
+    assert to_python(rows[100]['tags']) == {1: 'x', 2: "it's"}
+    assert to_python(rows[100]['attrs']) == {'end': 1, 'nil': 2, '名': 3, 'ok': 4}
+
+
+def test_empty_numeric_key_is_rejected(tmp_path, capsys):
+    source = tmp_path / 'source'
+    write_json(str(source / 'empty.json'), {
+        'Item': [('id', 'name'), ('int', 'string'), (1, 'a'), ('', 'b')],
+    })
+    with pytest.raises(ValueError, match="empty key"):
+        convert(LuaWriter, str(source), str(tmp_path / 'out'), formats='json')
+    assert "error in encoding: Item,id," in capsys.readouterr().out
+
+
+def test_empty_numeric_dict_key_is_rejected(tmp_path):
+    source = tmp_path / 'source'
+    write_json(str(source / 'empty.json'), {
+        'Item': [('id', 'bonus'), ('int', 'Map<int,int>'), (1, ',5')],
+    })
+    with pytest.raises(ValueError, match="empty key"):
+        convert(LuaWriter, str(source), str(tmp_path / 'out'), formats='json')
+
+
+def test_readonly_shared_tables_are_frozen(tmp_path):
+    source = tmp_path / 'source'
+    write_json(str(source / 'shared.json'), {
+        'Item': [
+            ('id', 'tags', 'parts'),
+            ('int', 'List<string>', 'List<Struct<int,pid,string,label>>'),
+            (1, 'x,y', '1,a,2,b'),
+            (2, 'x,y', '1,a,2,b'),
+        ],
+    })
+    out = convert(LuaWriter, str(source), str(tmp_path / 'out'), formats='json', dedup=True, readonly=True)
+    lua = lupa.LuaRuntime()
+    with open(os.path.join(out, 'Item.lua'), encoding='utf8') as f:
+        lua.globals().Item = lua.execute(f.read())
+    assert lua.eval("Item[1].tags == Item[2].tags and Item[1].parts == Item[2].parts")
+    assert lua.eval("#Item[1].tags") == 2
+    assert lua.eval("Item[1].tags[2]") == 'y'
+    assert lua.eval("Item[1].parts[2].label") == 'b'
+    assert lua.execute("local n = 0; for _, v in pairs(Item[1].parts) do n = n + v.pid end; return n") == 3
+    assert lua.execute("local s = ''; for _, v in ipairs(Item[1].tags) do s = s .. v end; return s") == 'xy'
+    for statement in ("Item[1].tags[1] = 'z'", "Item[1].tags[3] = 'z'", "Item[1].parts[1].label = 'z'",
+                      "Item[1].parts[1].extra = 1"):
+        with pytest.raises(lupa.LuaError, match="attempt to modify a shared table"):
+            lua.execute(statement)
+    assert lua.eval("Item[2].tags[1]") == 'x'
+
+
+def test_readonly_needs_lua_5_3(tmp_path):
+    source = tmp_path / 'source'
+    write_json(str(source / 'shared.json'), {'Item': [('id', 'tags'), ('int', 'List<string>'), (1, 'x,y')]})
+    with pytest.raises(Exception, match="-readonly needs Lua 5.3 or later, got -luaversion 5.1"):
+        convert(LuaWriter, str(source), str(tmp_path / 'out'), formats='json', dedup=True, readonly=True, luaversion='5.1')
+    convert(LuaWriter, str(source), str(tmp_path / 'out'), formats='json', dedup=True, luaversion='5.1')
+
+
+def test_compress_leaves_lua_modules_plain(source, tmp_path):
+    out = convert(LuaWriter, source, str(tmp_path / 'out'), formats='json', compress=True)
+    assert load_table(out, 'Text')[1]['name'] == 'plain'
+    with open(os.path.join(out, 'TableManager.lua'), encoding='utf8') as f:
+        assert 'require(' in f.read()
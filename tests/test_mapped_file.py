@@ -0,0 +1,45 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from easy_to_cpp import CppWriter
+from support import convert, write_workbook, requires_gxx, CPP_DIR
+
+@pytest.fixture(scope='module')
+def source(tmp_path_factory):
+    path = tmp_path_factory.mktemp('mmap') / 'source'
+    write_workbook(str(path / 'items.xlsx'), {
+        'Item': [('id', 'name', 'weight'), ('int', 'string', 'float'), (1, 'Line1\nLine2', 1.5), (2, 'a\\,b', 2)],
+    })
+    return str(path)
+
+
+@requires_gxx()
+@pytest.mark.skipif(not sys.platform.startswith('linux'), reason="reads /proc/self/maps")
+def test_mappings_are_released_on_reload(source, tmp_path):
+    out = convert(CppWriter, source, str(tmp_path / 'out'), mmap=True)
+    target = tmp_path / 'mapped.bin'
+    target.write_text('mapped')
+    program = str(tmp_path / 'mapped_file')
+    subprocess.run(['g++', '-std=c++17', '-I', out, os.path.join(out, 'MappedFile.cpp'),
+                    os.path.join(CPP_DIR, 'mapped_file_main.cpp'), '-o', program], check=True)
+    result = subprocess.run([program, str(target)], capture_output=True, text=True, check=True)
+    assert result.stdout.splitlines() == ['load 4', 'load 4', 'load 4', 'moved 1 mapped', 'released 0 owned']
+
+
+@requires_gxx()
+@pytest.mark.parametrize('options', [
+    dict(),
+    dict(compress=True),
+    dict(lazy='row', stringpool=True),
+    dict(dataformat='binary', compress=True, lazy='table'),
+    dict(dataformat='binary', lazy='row', index=True),
+], ids=['text', 'compress', 'lazy-row', 'binary-compress', 'binary-index'])
+def test_manager_owns_mapped_files(source, tmp_path, options):
+    out = convert(CppWriter, source, str(tmp_path / 'out'), mmap=True, **options)
+    for name in ('TableManager.cpp', 'DataBuffer.cpp', 'MappedFile.cpp'):
+        result = subprocess.run(['g++', '-std=c++17', '-fsyntax-only', '-I', out, os.path.join(out, name)],
+                                capture_output=True, text=True)
+        assert result.returncode == 0, result.stderr
@@ -0,0 +1,50 @@
+import os
+
+import pytest
+
+import easy_cache
+from easy_to_cs import CSharpWriter
+from support import convert, write_workbook
+
+ITEMS = [('id', 'name'), ('int', 'string'), (1, 'sword'), (2, 'shield')]
+SHOPS = [('code', 'price'), ('string', 'float'), ('apple', 1.5)]
+
+
+def list_files(root):
+    return sorted(os.path.relpath(os.path.join(directory, name), root)
+                  for directory, _, names in os.walk(root) for name in names)
+
+
+def test_prune_removes_only_outputs_of_the_previous_run(tmp_path):
+    source = str(tmp_path / 'source')
+    write_workbook(os.path.join(source, 'items.xlsx'), {'Item': ITEMS})
+    write_workbook(os.path.join(source, 'shops.xlsx'), {'Shop': SHOPS})
+    out = str(tmp_path / 'out')
+    convert(CSharpWriter, source, out, prune=True)
+    assert 'Shop.cs' in list_files(out)
+    # files that share an extension with the outputs but were never generated are kept
+    for name in ('Handwritten.cs', os.path.join('data', 'notes.txt')):
+        with open(os.path.join(out, name), 'w') as f:
+            f.write('keep')
+
+    os.remove(os.path.join(source, 'shops.xlsx'))
+    convert(CSharpWriter, source, out, prune=True)
+    files = list_files(out)
+    assert 'Shop.cs' not in files and os.path.join('data', 'Shop.txt') not in files
+    assert {'Item.cs', 'Handwritten.cs', os.path.join('data', 'Item.txt'), os.path.join('data', 'notes.txt')} <= set(files)
+
+
+def test_failed_write_leaves_no_temporary_file(tmp_path, monkeypatch):
+    source = str(tmp_path / 'source')
+    write_workbook(os.path.join(source, 'items.xlsx'), {'Item': ITEMS})
+    out = str(tmp_path / 'out')
+    convert(CSharpWriter, source, out)
+    before = {name: os.path.getmtime(os.path.join(out, name)) for name in list_files(out)}
+
+    def fail(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(easy_cache.os, 'replace', fail)
+    with pytest.raises(OSError):
+        convert(CSharpWriter, source, out, namespace='Other')
+    assert {name: os.path.getmtime(os.path.join(out, name)) for name in list_files(out)} == before
@@ -0,0 +1,75 @@
+import os
+import re
+
+import pytest
+
+from easy_converter import TableReader, TableValidator, FieldReference
+from easy_to_cs import CSharpWriter
+from easy_to_java import JavaWriter
+from easy_to_cpp import CppWriter
+from support import convert, write_workbook
+
+SHEETS = {
+    'Item': [
+        ('id', 'kind', 'pos'),
+        ('int', 'Enum<Common,1,Rare,2>', 'Struct<int,x,int,y>'),
+        (1, 'Common', '1,2'),
+        (2, 'Rare', '3,4'),
+    ],
+    'Shop': [
+        ('code', 'item', 'items', 'kind', 'pos'),
+        ('string', '@Item,id', 'List<@Item,id>', '@Item,Kind', '@Item,Pos'),
+        ('apple', 1, '1,2', 'Rare', '5,6'),
+        ('banana', 3, '2,4', 'Common', None),
+    ],
+}
+
+EXPECTED_TYPES = {
+    CSharpWriter: ('int item', 'List<int> items', 'Item.Kind kind', 'Item.Pos pos'),
+    JavaWriter: ('int item', 'ArrayList<Integer> items', 'Item.Kind kind', 'Item.Pos pos'),
+    CppWriter: ('int item', 'std::vector<int> items', 'Kind kind', 'Pos pos'),
+}
+
+
+@pytest.fixture
+def source(tmp_path):
+    write_workbook(str(tmp_path / 'source' / 'refs.xlsx'), SHEETS)
+    return str(tmp_path / 'source')
+
+
+def test_key_references_resolve_to_key_field(source):
+    tables = {table.name: table for table in TableReader(source=source, validate='off').create_tables()}
+    item, items, kind, pos = tables['Shop'].scheme.fields[1:]
+    assert isinstance(item, FieldReference) and item.ref_key and item.ref_type is tables['Item'].scheme.fields[0]
+    assert items.list_element_type.ref_key
+    assert not kind.ref_key and kind.ref_type is tables['Item'].scheme.fields[1]
+    assert not pos.ref_key and pos.ref_type is tables['Item'].scheme.fields[2]
+
+
+def test_missing_keys_are_reported(source, capsys):
+    with pytest.raises(Exception, match="validation failed"):
+        TableReader(source=source, validate='error').create_tables()
+    out = capsys.readouterr().out
+    assert "Shop[banana].item: Item has no key 3" in out
+    assert "Shop[banana].items: Item has no key 4" in out
+    assert "Shop[apple]" not in out
+
+
+def test_malformed_reference_cells_are_reported(source):
+    tables = TableReader(source=source, validate='off').create_tables()
+    shop = tables[1]
+    validator = TableValidator(tables)
+    items = shop.scheme.fields[2]
+    references = validator.find_references(shop, items, [('apple', '2,1'), ('banana', '1,2')])
+    assert references[items.list_element_type]['2'] == 'banana'
+    assert validator.errors == ["Shop[apple].items: invalid value 2,1"]
+
+
+@pytest.mark.parametrize('writer_type', [CSharpWriter, JavaWriter, CppWriter])
+def test_reference_types_are_rendered(source, tmp_path, writer_type):
+    out = convert(writer_type, source, str(tmp_path / 'out'), validate='off')
+    extension = {CSharpWriter: '.cs', JavaWriter: '.java', CppWriter: '.hpp'}[writer_type]
+    with open(os.path.join(out, 'Shop' + extension)) as f:
+        declarations = {re.sub(r'\s+', ' ', line.strip().rstrip(';')) for line in f}
+    for declaration in EXPECTED_TYPES[writer_type]:
+        assert any(line.endswith(declaration) for line in declarations), declaration
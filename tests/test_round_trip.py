@@ -0,0 +1,303 @@
+import glob
+import os
+import subprocess
+
+import pytest
+
+from easy_converter import TableReader, FieldType, FieldReference
+from easy_to_cs import CSharpWriter
+from easy_to_java import JavaWriter
+from easy_to_cpp import CppWriter
+from easy_to_lua import LuaWriter
+from support import convert, write_workbook, read_data, decode_field, decode_row, read_binary_index, read_text_index, \
+    TextReader, BinaryReader, FixedReader, requires_dotnet, requires_gxx, run_csharp, assert_lookups, CPP_DIR
+
+SHEETS = {
+    'Item': [
+        ('id', 'name', 'price', 'weight', 'usable', 'kind', 'extra', 'tags', 'stock'),
+        ('int', 'string', 'long', 'float', 'bool', 'Enum<Common,1,Rare,2,Epic,10>', 'Struct<int,a,string,b>',
+         'List<string>', 'Map<string,int>'),
+        (3, 'Sword\\,blade', 5000000000, 1.5, True, 'Common', '7,seven', 'x,y,z', 'atk,10,def,-5'),
+        (1, 'Line1\nLine2', -7, 0.1, False, 'Rare', '0,', 'a,b', 'hp,100'),
+        (20, 'Ünïcødé 名字', 0, -2.75, True, 'Epic', '-9,a\\b', None, None),
+        (-4, '', 1, 3, False, 'Common', '1,one', 'multi\nline,', 'key,1'),
+    ],
+    'Shop': [
+        ('code', 'item', 'items', 'item_kind', 'parts', 'slots', 'prices', 'kinds', 'pos'),
+        ('string', '@Item,id', 'List<@Item,id>', '@Item,Kind', 'List<Struct<int,pid,string,label>>',
+         'Map<int,bool>', 'List<float>', 'List<Enum<Low,0,High,1>>', 'Struct<int,x,int,y>'),
+        ('apple', 3, '1,20', 'Rare', '1,p1,2,p2', '1,true,4,false', '1.5,2', 'Low,High', '1,2'),
+        ('Banana', 1, '-4', 'Epic', '5,only', '7,False', '0.25', 'High', '0,0'),
+        ('école', 20, None, 'Common', None, None, None, None, '3,4'),
+        ('dur\nian', -4, '3,3', 'Common', '3,with\nbreak', '-1,TRUE', '-1', 'Low', '-5,5'),
+    ],
+}
+
+WRITERS = [CSharpWriter, JavaWriter, CppWriter]
+
+# every way a target can lay out its rows, decoded back to Python values
+VARIANTS = {
+    'binary': dict(dataformat='binary'),
+    'both': dict(dataformat='both'),
+    'text-stringpool': dict(dataformat='text', stringpool=True),
+    'binary-stringpool': dict(dataformat='binary', stringpool=True),
+    'binary-lazy-row': dict(dataformat='binary', lazy='row'),
+    'text-index': dict(dataformat='text', index=True),
+    'both-index': dict(dataformat='both', index=True),
+    'text-stringpool-index': dict(dataformat='text', stringpool=True, index=True),
+    'binary-stringpool-index': dict(dataformat='binary', stringpool=True, index=True),
+    'both-compress': dict(dataformat='both', compress=True, index=True),
+    'accessors': dict(accessors=True),
+}
+
+
+@pytest.fixture(scope='module')
+def source(tmp_path_factory):
+    path = tmp_path_factory.mktemp('round_trip') / 'source'
+    write_workbook(str(path / 'kinds.xlsx'), SHEETS)
+    return str(path)
+
+
+@pytest.fixture(scope='module')
+def schemes(source):
+    return {table.name: table.scheme.fields for table in TableReader(source=source).create_tables()}
+
+
+def by_key(rows):
+    rows = list(rows)
+    keyed = {row[0]: row for row in rows}
+    assert len(keyed) == len(rows)
+    return keyed
+
+
+def decode_text(data, name, fields, compress=False):
+    text = read_data(os.path.join(data, f"{name}.txt"), compress).decode('utf8')
+    pool = os.path.join(data, 'StringPool.txt')
+    strings = read_data(pool, compress).decode('utf8').split('\n') if os.path.exists(pool) else None
+    return [decode_row(fields, TextReader(line, strings)) for line in text.split('\n') if line]
+
+
+def decode_text_index(data, name, fields, compress=False):
+    text = read_data(os.path.join(data, f"{name}.txt"), compress)
+    pool = os.path.join(data, 'StringPool.txt')
+    strings = read_data(pool, compress).decode('utf8').split('\n') if os.path.exists(pool) else None
+    rows = []
+    for key, offset, length in read_text_index(os.path.join(data, f"{name}.index.txt"), compress):
+        rows.append(decode_row(fields, TextReader(text[offset:offset + length].decode('utf8'), strings)))
+        assert decode_field(fields[0], TextReader(key)) == rows[-1][0]
+    return rows
+
+
+def read_binary_strings(data, compress):
+    pool = os.path.join(data, 'StringPool.bytes')
+    return BinaryReader(read_data(pool, compress)).read_strings() if os.path.exists(pool) else None
+
+
+def decode_binary(data, name, fields, compress=False, row_prefix=False):
+    reader = BinaryReader(read_data(os.path.join(data, f"{name}.bytes"), compress))
+    reader.strings = read_binary_strings(data, compress) or reader.read_strings()
+    rows = []
+    for _ in range(reader.read_int()):
+        length = reader.read_int() if row_prefix else None
+        position = reader.position
+        rows.append(decode_row(fields, reader))
+        assert length is None or reader.position - position == length
+    assert reader.position == len(reader.data)
+    return rows
+
+
+def decode_binary_index(data, name, fields, compress=False):
+    rows = read_data(os.path.join(data, f"{name}.bytes"), compress)
+    shared = read_binary_strings(data, compress)
+    strings = shared or BinaryReader(rows).read_strings()
+    decoded = []
+    for key, offset, length in read_binary_index(os.path.join(data, f"{name}.index.bytes"), fields[0].field_def,
+                                                 shared, compress):
+        reader = BinaryReader(rows, offset, strings)
+        decoded.append(decode_row(fields, reader))
+        assert decoded[-1][0] == key and reader.position - offset == length
+    return decoded
+
+
+def decode_outputs(data, name, fields, options):
+    """Decodes every data file a conversion wrote for one table, keyed by how it was read."""
+    compress = bool(options.get('compress'))
+    if options.get('accessors'):
+        return {'fixed': FixedReader(read_data(os.path.join(data, f"{name}.fixed.bytes"))).read_table(fields)}
+    decoded = {}
+    if options.get('dataformat', 'text') != 'binary':
+        decoded['text'] = decode_text(data, name, fields, compress)
+        if options.get('index'):
+            decoded['text index'] = decode_text_index(data, name, fields, compress)
+    if options.get('dataformat') in ('binary', 'both'):
+        row_prefix = options.get('lazy') == 'row' and not options.get('index')
+        decoded['binary'] = decode_binary(data, name, fields, compress, row_prefix)
+        if options.get('index'):
+            decoded['binary index'] = decode_binary_index(data, name, fields, compress)
+    return decoded
+
+
+@pytest.fixture(scope='module')
+def expected(source, schemes, tmp_path_factory):
+    data = os.path.join(convert(CSharpWriter, source, str(tmp_path_factory.mktemp('expected'))), 'data')
+    return {name: by_key(decode_text(data, name, fields)) for name, fields in schemes.items()}
+
+
+def test_text_rows_match_source(expected):
+    assert [row[:4] for row in expected['Item'].values()] == [
+        (3, 'Sword,blade', 5000000000, 1.5),
+        (1, 'Line1\\nLine2', -7, pytest.approx(0.1)),
+        (20, 'Ünïcødé 名字', 0, -2.75),
+        (-4, '', 1, 3.0),
+    ]
+    assert expected['Shop']['apple'][1:] == (3, [1, 20], 2, [(1, 'p1'), (2, 'p2')], [(1, True), (4, False)],
+                                             [1.5, 2.0], [0, 1], (1, 2))
+    assert expected['Shop']['école'][2:] == ([], 1, [], [], [], [], (3, 4))
+
+
+@pytest.mark.parametrize('variant', list(VARIANTS))
+@pytest.mark.parametrize('writer_type', WRITERS)
+def test_every_layout_decodes_to_the_same_rows(source, schemes, expected, tmp_path, writer_type, variant):
+    options = VARIANTS[variant]
+    if options.get('accessors') and writer_type is CppWriter:
+        pytest.skip("the C++ writer has no -accessors layout")
+    data = os.path.join(convert(writer_type, source, str(tmp_path / 'out'), **options), 'data')
+    for name, fields in schemes.items():
+        decoded = decode_outputs(data, name, fields, options)
+        assert decoded
+        for layout, rows in decoded.items():
+            assert by_key(rows) == expected[name], (name, layout)
+
+
+def to_lua_value(field, value):
+    """Reshapes a decoded value the way the Lua writer lays it out.
+
+    Lua keeps real newlines in strings and writes floats as doubles rather than 32-bit values.
+    """
+    while isinstance(field, FieldReference):
+        field = field.ref_type
+    if field.field_type == FieldType.Primitive and field.field_def == 'string':
+        return value.replace('\\n', '\n')
+    if field.field_type == FieldType.Primitive and field.field_def == 'float':
+        return pytest.approx(value)
+    if field.field_type == FieldType.Primitive:
+        return value
+    if field.field_type == FieldType.Enum:
+        return value
+    if field.field_type == FieldType.Struct:
+        return {f.field_name: to_lua_value(f, v) for f, v in zip(field.struct_fields, value)}
+    if field.field_type == FieldType.List:
+        return {i + 1: to_lua_value(field.list_element_type, v) for i, v in enumerate(value)}
+    return {to_lua_value(field.dict_key_type, k): to_lua_value(field.dict_value_type, v) for k, v in value}
+
+
+# copies through pairs so that the read-only proxies of -readonly are walked like plain tables
+LUA_COPY = """
+local function copy(value)
+    if type(value) ~= 'table' then
+        return value
+    end
+    local result = {}
+    for k, v in pairs(value) do
+        result[k] = copy(v)
+    end
+    return result
+end
+return copy
+"""
+
+
+@pytest.mark.parametrize('options', [{}, dict(dedup=True), dict(dedup=True, readonly=True)],
+                         ids=['plain', 'dedup', 'readonly'])
+def test_lua_tables_match_decoded_rows(source, schemes, expected, tmp_path, options):
+    lupa = pytest.importorskip('lupa')
+
+    def to_python(value):
+        if lupa.lua_type(value) == 'table':
+            return {k: to_python(v) for k, v in value.items()}
+        return value
+
+    out = convert(LuaWriter, source, str(tmp_path / 'out'), **options)
+    lua = lupa.LuaRuntime()
+    copy = lua.execute(LUA_COPY)
+    for name, fields in schemes.items():
+        with open(os.path.join(out, f"{name}.lua"), encoding='utf8') as f:
+            rows = to_python(copy(lua.execute(f.read())))
+        assert rows == {
+            to_lua_value(fields[0], key): {f.field_name: to_lua_value(f, v) for f, v in zip(fields, row)}
+            for key, row in expected[name].items()
+        }
+
+
+# each run is built and loaded by tests/csharp/Program.cs and must dump the same rows
+CSHARP_RUNS = {
+    'text': dict(dataformat='text'),
+    'binary': dict(dataformat='binary'),
+    'binary-stringpool': dict(dataformat='binary', stringpool=True),
+    'text-lazy-row': dict(dataformat='text', lazy='row'),
+    'binary-stringpool-lazy-table': dict(dataformat='binary', stringpool=True, lazy='table'),
+    'text-index-lazy-row': dict(dataformat='text', index=True, lazy='row'),
+    'binary-index-lazy-row': dict(dataformat='binary', index=True, lazy='row'),
+    'binary-compress': dict(dataformat='binary', compress=True),
+    'accessors': dict(accessors=True),
+    'binary-compress-async': dict(dataformat='binary', compress=True, asyncload=True),
+    'text-lazy-row-async': dict(dataformat='text', lazy='row', asyncload=True),
+}
+
+
+@requires_dotnet()
+def test_csharp_loads_the_same_rows_from_every_layout(source, tmp_path):
+    reports = {}
+    for run, options in CSHARP_RUNS.items():
+        out = convert(CSharpWriter, source, str(tmp_path / run), **options)
+        reports[run] = run_csharp(out, str(tmp_path / 'app' / run), 'async' if options.get('asyncload') else 'sync')
+        assert_lookups(reports[run], {'GetAllItems': 4, 'GetAllShops': 4})
+    for run, report in reports.items():
+        assert report == reports['text'], run
+
+
+def run_cpp(gen_dir, work_dir, options):
+    """Builds the generated C++ code with tests/cpp/round_trip_main.cpp and returns its report grouped by table."""
+    os.makedirs(work_dir, exist_ok=True)
+    program = os.path.join(work_dir, 'round_trip')
+    sources = sorted(glob.glob(os.path.join(gen_dir, '*.cpp'))) + [os.path.join(CPP_DIR, 'round_trip_main.cpp')]
+    flags = ['-DMAPPED'] if options.get('mmap') else []
+    libs = ['-lz'] if options.get('compress') else []
+    subprocess.run(['g++', '-std=c++17', *flags, '-I', gen_dir, *sources, '-o', program, *libs], check=True)
+    ext = '.bytes' if options.get('dataformat') == 'binary' else '.txt'
+    result = subprocess.run([program, os.path.join(gen_dir, 'data'), ext], capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stdout + result.stderr
+    report = {}
+    for line in result.stdout.splitlines():
+        table, _, text = line.partition(' ')
+        report.setdefault(table, []).append(text)
+    return report
+
+
+# string keys exercise Decode and Get with std::string and std::string_view parameters
+CPP_RUNS = {
+    'text': dict(dataformat='text'),
+    'text-stringpool': dict(dataformat='text', stringpool=True),
+    'text-lazy-row': dict(dataformat='text', lazy='row'),
+    'binary-lazy-row': dict(dataformat='binary', lazy='row'),
+    'binary-lazy-table': dict(dataformat='binary', lazy='table'),
+    'binary-index-lazy-row': dict(dataformat='binary', index=True, lazy='row'),
+    'mmap-lazy-row': dict(dataformat='text', lazy='row', mmap=True),
+    'binary-compress-lazy-row': dict(dataformat='binary', compress=True, lazy='row'),
+}
+
+
+@requires_gxx()
+def test_cpp_loads_the_same_rows_from_every_layout(source, tmp_path):
+    reports = {}
+    for run, options in CPP_RUNS.items():
+        out = convert(CppWriter, source, str(tmp_path / run), **options)
+        reports[run] = run_cpp(out, str(tmp_path / 'build' / run), options)
+        for table, lines in reports[run].items():
+            assert lines[-1] == "lookup ok=4 bad=0 missing=threw", (run, table)
+    assert reports['text']['Shop'][:2] == [
+        "'Banana'|1|[-4]|10|[(5,'only')]|{7:false}|[0.25]|[1]|(0,0)",
+        "'apple'|3|[1,20]|2|[(1,'p1'),(2,'p2')]|{1:true,4:false}|[1.5,2]|[0,1]|(1,2)",
+    ]
+    for run, report in reports.items():
+        assert report == reports['text'], run
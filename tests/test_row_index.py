@@ -0,0 +1,95 @@
+import os
+
+import pytest
+
+from easy_to_cs import CSharpWriter
+from easy_to_java import JavaWriter
+from easy_to_cpp import CppWriter
+from support import convert, write_workbook, read_binary_index, read_text_index, BinaryReader, requires_dotnet, \
+    run_csharp, assert_lookups
+
+WORDS = ['alice', 'Bob', 'apple', 'Zoe', 'banana', 'école', 'Éclair', 'ｚenith', '😀smile', 'a\\,b']
+
+# how each target runtime compares string keys: C# and Java compare UTF-16 code units, C++ compares UTF-8 bytes
+STRING_ORDERS = {
+    CSharpWriter: lambda s: s.encode('utf-16-be'),
+    JavaWriter: lambda s: s.encode('utf-16-be'),
+    CppWriter: lambda s: s.encode('utf8'),
+}
+
+EXPECTED_KEYS = {
+    'Score': [-1.0, 0.5, 2.5, 10.0],
+    'Grade': [1, 3, 5],
+    'Level': [-3, 2, 10],
+}
+
+KEY_DEFS = {'Word': 'string', 'Score': 'float', 'Grade': 'int', 'Level': 'int'}
+
+
+@pytest.fixture(scope='module')
+def source(tmp_path_factory):
+    path = tmp_path_factory.mktemp('index') / 'source'
+    write_workbook(str(path / 'keys.xlsx'), {
+        'Word': [('key', 'value'), ('string', 'int')] + [(word, i) for i, word in enumerate(WORDS)],
+        'Score': [('key', 'name'), ('float', 'string')] + [(key, f"s{key}") for key in (2.5, -1.0, 10.0, 0.5)],
+        'Grade': [('key', 'name'), ('Enum<Low,5,High,1,Mid,3>', 'string')] + [(key, key.lower()) for key in ('Low', 'High', 'Mid')],
+        'Level': [('key', 'name'), ('int', 'string')] + [(key, f"l{key}") for key in (10, 2, -3)],
+    })
+    return str(path)
+
+
+def expected_keys(writer_type, table):
+    if table == 'Word':
+        return sorted((word.replace('\\,', ',') for word in WORDS), key=STRING_ORDERS[writer_type])
+    return EXPECTED_KEYS[table]
+
+
+def test_string_orders_differ():
+    words = [word.replace('\\,', ',') for word in WORDS]
+    assert sorted(words, key=STRING_ORDERS[CSharpWriter]) != sorted(words, key=STRING_ORDERS[CppWriter])
+
+
+@pytest.mark.parametrize('writer_type', [CSharpWriter, JavaWriter, CppWriter])
+def test_binary_index_matches_runtime_order(source, tmp_path, writer_type):
+    data = os.path.join(convert(writer_type, source, str(tmp_path), dataformat='both', index=True), 'data')
+    for table, field_def in KEY_DEFS.items():
+        entries = read_binary_index(os.path.join(data, f"{table}.index.bytes"), field_def)
+        keys = [key for key, _, _ in entries]
+        assert keys == expected_keys(writer_type, table)
+
+        with open(os.path.join(data, f"{table}.bytes"), 'rb') as f:
+            rows = f.read()
+        strings = BinaryReader(rows).read_strings()
+        for key, offset, length in entries:
+            assert BinaryReader(rows, offset).read_key(field_def, strings) == key
+
+
+@pytest.mark.parametrize('writer_type', [CSharpWriter, JavaWriter, CppWriter])
+def test_text_index_points_at_rows(source, tmp_path, writer_type):
+    data = os.path.join(convert(writer_type, source, str(tmp_path), dataformat='both', index=True), 'data')
+    for table, field_def in KEY_DEFS.items():
+        with open(os.path.join(data, f"{table}.txt"), 'rb') as f:
+            text = f.read()
+        assert b'\r' not in text
+        entries = read_text_index(os.path.join(data, f"{table}.index.txt"))
+        assert len(entries) == len(text.split(b'\n'))
+        for key, offset, length in entries:
+            assert text[offset:offset + length].decode('utf8').split(',', 1)[0] == key
+        if field_def == 'string':
+            keys = [key.replace(':l/~', ',') for key, _, _ in entries]
+        else:
+            keys = [float(key) if field_def == 'float' else int(key) for key, _, _ in entries]
+        assert keys == expected_keys(writer_type, table)
+
+
+@requires_dotnet()
+@pytest.mark.parametrize('options', [
+    dict(dataformat='binary', index=True),
+    dict(dataformat='binary', index=True, stringpool=True),
+    dict(dataformat='binary', index=True, compress=True),
+    dict(dataformat='binary', index=True, asyncload=True),
+], ids=['plain', 'stringpool', 'compress', 'asyncload'])
+def test_csharp_index_loads_every_row(source, tmp_path, options):
+    out = convert(CSharpWriter, source, str(tmp_path / 'out'), **options)
+    report = run_csharp(out, str(tmp_path / 'app'), 'async' if options.get('asyncload') else 'sync')
+    assert_lookups(report, {'GetAllWords': len(WORDS), 'GetAllScores': 4, 'GetAllGrades': 3, 'GetAllLevels': 3})
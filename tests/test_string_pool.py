@@ -0,0 +1,66 @@
+import glob
+import os
+import shutil
+import subprocess
+
+from easy_to_cs import CSharpWriter
+from easy_to_cpp import CppWriter
+from support import convert, write_workbook, requires_dotnet, requires_gxx, run_csharp, assert_lookups, CPP_DIR
+
+
+def write_source(path):
+    return os.path.dirname(write_workbook(path, {
+        'Item': [
+            ('id', 'name', 'tags'),
+            ('int', 'string', 'List<string>'),
+            (1, 'sword', 'sharp,steel'),
+            (2, 'Line1\nLine2', 'steel'),
+            (3, 'sword', None),
+        ],
+        'Shop': [
+            ('code', 'title'),
+            ('string', 'string'),
+            ('steel', 'sword'),
+            ('wood', 'a\\,b'),
+        ],
+    }))
+
+
+def test_string_pool_is_shared_and_unix_newlines(tmp_path):
+    source = write_source(str(tmp_path / 'source' / 'pool.xlsx'))
+    data = os.path.join(convert(CSharpWriter, source, str(tmp_path / 'out'), stringpool=True), 'data')
+    with open(os.path.join(data, 'StringPool.txt'), 'rb') as f:
+        pool = f.read().decode('utf8')
+    assert '\r' not in pool
+    strings = pool.split('\n')
+    assert len(strings) == len(set(strings))
+    assert {'sword', 'steel', 'sharp', 'wood'} <= set(strings)
+
+
+@requires_dotnet()
+def test_csharp_loads_pool_with_crlf(tmp_path):
+    source = write_source(str(tmp_path / 'source' / 'pool.xlsx'))
+    out = convert(CSharpWriter, source, str(tmp_path / 'out'), stringpool=True)
+    expected = run_csharp(out, str(tmp_path / 'app'))
+    assert_lookups(expected, {'GetAllItems': 3, 'GetAllShops': 2})
+
+    crlf = str(tmp_path / 'crlf')
+    shutil.copytree(out, crlf)
+    for path in glob.glob(os.path.join(crlf, 'data', '*.txt')):
+        with open(path, 'rb') as f:
+            text = f.read()
+        with open(path, 'wb') as f:
+            f.write(text.replace(b'\n', b'\r\n'))
+    assert run_csharp(crlf, str(tmp_path / 'app')) == expected
+
+
+@requires_gxx()
+def test_cpp_text_pool_lookups_are_checked(tmp_path):
+    source = write_source(str(tmp_path / 'source' / 'pool.xlsx'))
+    out = convert(CppWriter, source, str(tmp_path / 'out'), stringpool=True)
+    program = str(tmp_path / 'string_pool')
+    subprocess.run(['g++', '-std=c++17', '-I', out, os.path.join(out, 'DataBuffer.cpp'),
+                    os.path.join(CPP_DIR, 'string_pool_main.cpp'), '-o', program], check=True)
+    result = subprocess.run([program], capture_output=True, text=True, check=True)
+    assert result.stdout.splitlines() == ['one', 'two', 'out_of_range', 'invalid_argument', 'invalid_argument',
+                                          'invalid_argument', 'invalid_argument']
@@ -0,0 +1,149 @@
+import os
+import sys
+
+import openpyxl
+import pytest
+
+from easy_converter import TableReader, Table, FieldList, FieldDictionary, FieldStruct, FieldEnum, FieldReference
+from support import write_workbook, write_json
+
+SHEETS = {
+    'Item': [
+        ('id', 'name', 'price', 'weight', 'usable', 'kind', 'extra'),
+        ('int', 'string', 'long', 'float', 'bool', 'Enum<Common,1,Rare,2,Epic,10>', 'Struct<int,a,string,b>'),
+        (1, 'Sword\\,blade', 5000000000, 1.5, True, 'Common', '7,seven'),
+        (2, 'Line1\nLine2', -7, 0.25, False, 'Rare', None),
+        (3, 'Ünïcødé 名字', 0, -2.75, True, 'Epic', '9,a\\b'),
+        (4, None, None, None, None, 'Common', ',only'),
+        (None, 'skipped', 1, 1.0, True, 'Common', None),
+        (5, 'back\\slash', 1, 3, False, 'Rare', '1,'),
+    ],
+    'Shop': [
+        ('code', 'tags', 'stock', 'kinds', 'parts', 'slots', 'prices', 'item_kind', 'pos'),
+        ('string', 'List<string>', 'Map<string,int>', 'List<Enum<Low,0,High,1>>', 'List<Struct<int,pid,string,label>>',
+         'Map<int,Struct<int,x,int,y>>', 'List<float>', '@Item,Kind', 'Struct<int,x,int,y>'),
+        ('apple', 'x,y,z', 'atk,10,def,-5', 'Low,High', '1,p1,2,p2', '1,2,3,4,5,6', '1.5,2', 'Rare', '1,2'),
+        ('Banana', 'a\\,b,c', 'hp,100', 'High', '5,only', '7,8,9', '0.25', 'Epic', None),
+        ('cherry', None, None, None, None, None, None, 'Common', '3,4'),
+        ('dur\nian', 'multi\nline,x', 'k\\,ey,1', 'Low', '3,with\nbreak', '1,0,0', '-1', 'Common', ',5'),
+    ],
+}
+
+
+def reference_elements(raw_cell, field):
+    if raw_cell is None or raw_cell == '':
+        return []
+    elements = raw_cell.split(',')
+    if isinstance(field, FieldList):
+        size = len(field.list_element_type.struct_fields) if isinstance(field.list_element_type, FieldStruct) else 1
+        return [','.join(elements[i:i + size]) for i in range(0, len(elements), size)]
+    if isinstance(field, FieldDictionary):
+        size = len(field.dict_value_type.struct_fields) if isinstance(field.dict_value_type, FieldStruct) else 1
+        return [(elements[i], ','.join(elements[i + 1:i + 1 + size])) for i in range(0, len(elements), size + 1)]
+    return elements
+
+
+def reference_cell_to_str(field, raw_cell):
+    """The recursive per-cell conversion the compiled cell encoders replaced."""
+    if isinstance(field, FieldReference):
+        return reference_cell_to_str(field.ref_type, raw_cell)
+    if isinstance(field, FieldList):
+        if raw_cell == '':
+            return '0'
+        elements = reference_elements(raw_cell, field)
+        return ','.join([str(len(elements))] + [reference_cell_to_str(field.list_element_type, e) for e in elements])
+    if isinstance(field, FieldDictionary):
+        if raw_cell == '':
+            return '0'
+        elements = reference_elements(raw_cell, field)
+        parts = [str(len(elements))]
+        for key, value in elements:
+            parts += [reference_cell_to_str(field.dict_key_type, key), reference_cell_to_str(field.dict_value_type, value)]
+        return ','.join(parts)
+    if isinstance(field, FieldStruct):
+        raw_str = ''
+        for f, e in zip(field.struct_fields, reference_elements(raw_cell, field)):
+            if raw_str != '':
+                raw_str += ','
+            raw_str += reference_cell_to_str(f, e)
+        return raw_str
+    if isinstance(field, FieldEnum):
+        enum_value = field.enum_key_to_value.get(raw_cell)
+        if enum_value is None:
+            raise Exception('invalid enum key:' + str(raw_cell))
+        return str(enum_value)
+    if raw_cell is None:
+        return ''
+    raw_str = str(raw_cell)
+    for old, new in Table.special_str.items():
+        raw_str = raw_str.replace(old, new)
+    return raw_str
+
+
+@pytest.fixture(scope='module')
+def source(tmp_path_factory):
+    path = tmp_path_factory.mktemp('data') / 'source'
+    write_workbook(str(path / 'kinds.xlsx'), SHEETS)
+    return str(path)
+
+
+def read_tables(source, **options):
+    return {table.name: table for table in TableReader(source=source, **options).create_tables()}
+
+
+def expected_rows(source, table):
+    workbook = openpyxl.load_workbook(os.path.join(source, 'kinds.xlsx'))
+    rows = workbook[table.name].iter_rows(values_only=True, min_row=3, max_col=len(table.scheme.fields))
+    return [tuple(reference_cell_to_str(field, cell) for field, cell in zip(table.scheme.fields, row))
+            for row in rows if row[0] is not None]
+
+
+def test_fast_path_matches_per_cell_path(source):
+    tables = read_tables(source)
+    assert set(tables) == set(SHEETS)
+    for table in tables.values():
+        assert list(table.data.iter_values()) == expected_rows(source, table)
+        assert [tuple(str(cell) for cell in row) for row in table.data] == expected_rows(source, table)
+
+
+def test_streamed_rows_match_table_data(source):
+    tables = read_tables(source)
+    streamed = read_tables(source, stream=True)
+    for name, table in tables.items():
+        assert [tuple(row) for row in streamed[name].iter_rows()] == list(table.data.iter_values())
+
+
+def test_xlsx_backend_matches_openpyxl(source):
+    tables = read_tables(source)
+    for name, table in read_tables(source, backend='xlsx').items():
+        assert list(table.data.iter_values()) == list(tables[name].data.iter_values())
+
+
+@pytest.mark.skipif(not sys.platform.startswith('linux'), reason="reads /proc/self/fd")
+def test_xlsx_backend_closes_the_workbook(tmp_path):
+    def open_files():
+        fd_dir = '/proc/self/fd'
+        return [os.path.realpath(os.path.join(fd_dir, fd)) for fd in os.listdir(fd_dir)]
+
+    path = os.path.realpath(write_workbook(str(tmp_path / 'source' / 'kinds.xlsx'), SHEETS))
+    tables = read_tables(os.path.dirname(path), backend='xlsx', stream=True)
+    assert path not in open_files()
+    rows = tables['Item'].iter_rows()
+    next(rows)
+    assert path in open_files()
+    rows.close()
+    assert path not in open_files()
+
+
+def test_only_requested_source_formats_are_read(tmp_path):
+    source = tmp_path / 'source'
+    write_workbook(str(source / 'items.xlsx'), {'Item': SHEETS['Item']})
+    write_json(str(source / 'shops.json'), {'Shop': SHEETS['Shop']})
+    # a profile report left in the source folder is not a table
+    (source / 'easy_converter_profile.json').write_text('{"stages": []}')
+    (source / 'notes.csv').write_text('not,a\ntable,\n')
+    assert list(read_tables(str(source))) == ['Item']
+    os.remove(source / 'easy_converter_profile.json')
+    assert sorted(read_tables(str(source), formats='xlsx, json')) == ['Item', 'Shop']
+    with pytest.raises(Exception, match="unknown format: xls"):
+        TableReader(source=str(source), formats='xls')
@@ -0,0 +1,57 @@
+import pytest
+
+from easy_converter import EasyConverter, TableReader, SheetData
+from easy_to_cs import CSharpWriter
+from support import convert, write_workbook
+
+
+@pytest.fixture
+def source(tmp_path):
+    write_workbook(str(tmp_path / 'source' / 'dup.xlsx'), {
+        'Item': [('id', 'name'), ('int', 'string'), (1, 'a'), (2, 'b'), (1, 'c')],
+    })
+    return str(tmp_path / 'source')
+
+
+def test_duplicate_keys_warn_by_default(source, capsys):
+    assert EasyConverter.create_arg_parser().parse_args([]).validate is None
+    tables = TableReader(source=source).create_tables()
+    assert [table.name for table in tables] == ['Item']
+    assert "warning in validating: Item: duplicate key 1 in 2 rows" in capsys.readouterr().out
+
+
+def test_duplicate_keys_fail_with_validate_error(source, capsys):
+    with pytest.raises(Exception, match="validation failed"):
+        TableReader(source=source, validate='error').create_tables()
+    assert "error in validating: Item: duplicate key 1 in 2 rows" in capsys.readouterr().out
+
+
+def test_validate_off_skips_checks(source, capsys):
+    TableReader(source=source, validate='off').create_tables()
+    assert "validating" not in capsys.readouterr().out
+
+
+def test_streamed_tables_are_validated_only_when_asked(source, capsys):
+    TableReader(source=source, stream=True).create_tables()
+    assert "validating" not in capsys.readouterr().out
+    TableReader(source=source, stream=True, validate='warn').create_tables()
+    assert "warning in validating: Item: duplicate key 1 in 2 rows" in capsys.readouterr().out
+
+
+def test_cached_sheets_are_read_once_for_validation_and_output(tmp_path, monkeypatch):
+    source = str(tmp_path / 'source')
+    write_workbook(str(tmp_path / 'source' / 'refs.xlsx'), {
+        'Item': [('id', 'name'), ('int', 'string'), (1, 'a'), (2, 'b')],
+        'Shop': [('code', 'item', 'items'), ('string', '@Item,id', 'List<@Item,id>'), ('apple', 1, '1,2')],
+    })
+    reads = []
+    iter_rows = SheetData.iter_rows
+
+    def read_rows(sheet, *args, **kwargs):
+        if kwargs.get('min_row') == 3:
+            reads.append(sheet.title)
+        return iter_rows(sheet, *args, **kwargs)
+
+    monkeypatch.setattr(SheetData, 'iter_rows', read_rows)
+    convert(CSharpWriter, source, str(tmp_path / 'out'), cache=str(tmp_path / 'cache'))
+    assert sorted(reads) == ['Item', 'Shop']